@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Batch Performance Verification
+==============================
+
+Runs the verify_performance statistics (calculate_basic_stats plus
+calculate_risk_metrics) over many P&L files in parallel - one file per
+task across all cores - and writes a single consolidated summary.
+
+Each input file uses the live simulation schema:
+    date, daily_return_pct, account_value_usd[, ...]
+
+Usage:
+    python scripts/batch_verify.py "accounts/*.csv" --output summary.csv
+    python scripts/batch_verify.py accounts/ --output summary.parquet
+
+Requirements:
+    pip install pandas numpy
+    pip install pyarrow  # only for .parquet output
+"""
+
+import argparse
+import glob
+import importlib.util
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from verify_performance import (calculate_basic_stats, calculate_risk_metrics,
+                                calculate_stats_streaming, load_data)
+
+def find_files(pattern):
+    """
+    Expand a directory or glob pattern into a sorted list of CSV files
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.csv')
+    return sorted(glob.glob(pattern, recursive=True))
+
+def verify_file(filepath, streaming=False):
+    """
+    Compute the verification statistics for one file
+
+    Returns:
+        dict: Flat summary row, with 'error' set if the file failed
+    """
+    start = time.perf_counter()
+    row = {'file': filepath}
+
+    try:
+        if streaming:
+            basic_stats, risk_metrics = calculate_stats_streaming(filepath)
+        else:
+            df = load_data(filepath)
+            basic_stats = calculate_basic_stats(df)
+            risk_metrics = calculate_risk_metrics(df)
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        row['seconds'] = time.perf_counter() - start
+        return row
+
+    best_day = basic_stats.pop('best_day')
+    worst_day = basic_stats.pop('worst_day')
+
+    row.update(basic_stats)
+    row['best_day_date'] = best_day['date']
+    row['best_day_pct'] = best_day['daily_return_pct']
+    row['worst_day_date'] = worst_day['date']
+    row['worst_day_pct'] = worst_day['daily_return_pct']
+    row.update(risk_metrics)
+    row['error'] = None
+    row['seconds'] = time.perf_counter() - start
+    return row
+
+def verify_batch(files, max_workers=None, streaming=False, progress=True):
+    """
+    Verify files in parallel, reporting progress as each one finishes
+
+    Returns:
+        pd.DataFrame: One row per file, in input order
+    """
+    rows = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(verify_file, path, streaming): path for path in files}
+        for done, future in enumerate(as_completed(futures), start=1):
+            path = futures[future]
+            row = future.result()
+            rows[path] = row
+            if progress:
+                status = "✗ " + row['error'] if row['error'] else "✓"
+                print(f"[{done:>{len(str(len(files)))}}/{len(files)}] "
+                      f"{row['seconds'] * 1000:8.1f} ms  {path}  {status}")
+
+    summary = pd.DataFrame([rows[path] for path in files])
+
+    # Keep counts integral even when failed files leave gaps
+    for column in ('num_days', 'wins', 'losses'):
+        if column in summary:
+            summary[column] = summary[column].astype('Int64')
+    return summary
+
+def check_writer(output):
+    """
+    Fail before any work if the summary cannot be written
+
+    Raises:
+        ImportError: For .parquet output without pyarrow or fastparquet
+    """
+    if output.endswith('.parquet') and not any(
+            importlib.util.find_spec(engine) for engine in ('pyarrow', 'fastparquet')):
+        raise ImportError("Parquet output needs pyarrow (pip install pyarrow)")
+
+def write_summary(summary, output):
+    """Write the summary as Parquet (.parquet) or CSV (anything else)"""
+    if output.endswith('.parquet'):
+        summary.to_parquet(output, index=False)
+    else:
+        summary.to_csv(output, index=False)
+
+def main():
+    """Verify every file matching the input pattern"""
+
+    parser = argparse.ArgumentParser(description="Batch performance verification")
+    parser.add_argument('inputs', help="Directory or glob pattern of P&L CSV files")
+    parser.add_argument('--output', default='verification_summary.csv',
+                        help="Summary file (.csv or .parquet)")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Use the single-pass chunked reader for each file")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 80)
+    print("CLAUDE QUANT - BATCH PERFORMANCE VERIFICATION")
+    print("=" * 80 + "\n")
+
+    files = find_files(args.inputs)
+    if not files:
+        print(f"ERROR: No CSV files match {args.inputs}")
+        return
+
+    try:
+        check_writer(args.output)
+    except ImportError as e:
+        print(f"ERROR: {e}")
+        return
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"Verifying {len(files)} files on {workers} workers...\n")
+
+    start = time.perf_counter()
+    summary = verify_batch(files, args.workers, args.streaming)
+    elapsed = time.perf_counter() - start
+
+    write_summary(summary, args.output)
+
+    failed = summary['error'].notna().sum()
+    print(f"\n✓ {len(files) - failed} files verified, {failed} failed")
+    print(f"✓ Total time: {elapsed:.2f}s (sum of per-file time: {summary['seconds'].sum():.2f}s)")
+    print(f"✓ Summary written to {args.output}")
+    print("\n" + "=" * 80 + "\n")
+
+if __name__ == "__main__":
+    main()
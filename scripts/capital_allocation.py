@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Sequential vs Parallel Capital Allocation Simulator
+===================================================
+
+Compares the two allocation schemes in docs/CAPITAL_EFFICIENCY.md on
+per-session returns (one column per SessionManager.SESSIONS market, in
+session order Nikkei -> DAX -> Nasdaq):
+
+- Sequential: the whole account trades every session; each session's
+  result is compounded into the capital of the next one
+- Parallel: the account is split into one sub-account per market
+  (equal weights by default); each compounds only its own sessions
+
+For every scenario it reports CAGR, maximum drawdown (marked after each
+session close) and the efficiency ratio: sequential / parallel ending
+equity (growth multiples). Unlike a ratio of returns it stays meaningful
+when the parallel return is zero or negative - above 1 means sequential
+ended with more capital.
+Idle capital is the share of session hours (from the SESSIONS open and
+close times) during which capital sits in a market that is closed.
+
+Everything is vectorized across scenarios, days and sessions at once;
+scenarios are processed in batches across processes and only per-
+scenario summaries are kept, so 10^7 session-days run in seconds with
+bounded memory.
+
+Usage:
+    python scripts/capital_allocation.py
+    python scripts/capital_allocation.py --scenarios 40000 --days 252
+
+Requirements:
+    pip install pytz numpy pandas
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from monte_carlo import TRADING_DAYS_PER_YEAR, summarize
+from session_sequencing_reference import SessionManager
+
+MARKETS = tuple(SessionManager.SESSIONS)
+
+DEFAULT_BATCH_DAYS = 1_000_000   # scenario-days per batch
+
+# Example per-session strategy: ~50% a year, 1.2% daily vol (docs example)
+EXAMPLE_ANNUAL_RETURN = 0.50
+EXAMPLE_DAILY_VOL = 0.012
+EXAMPLE_CORRELATION = 0.3
+
+def session_hours(sessions=None):
+    """
+    Session lengths in hours, in session order
+
+    Returns:
+        np.ndarray: float64 hours per market
+    """
+    sessions = sessions or SessionManager.SESSIONS
+    hours = []
+    for config in sessions.values():
+        day = datetime(2000, 1, 3)
+        open_ = datetime.combine(day, config['open'])
+        close = datetime.combine(day, config['close'])
+        hours.append((close - open_).total_seconds() / 3600)
+    return np.array(hours)
+
+def utilization(weights=None, sessions=None):
+    """
+    Share of capital at work, time-weighted over session hours and the day
+
+    Sequential deploys the whole account in every session; in parallel
+    only the open market's sub-account works.
+
+    Returns:
+        dict: 'sequential'/'parallel' -> {'session': share of session
+              hours, 'day': share of 24 hours}
+    """
+    hours = session_hours(sessions)
+    weights = _weights(weights, len(hours))
+    parallel = float(np.dot(weights, hours))
+    return {
+        'sequential': {'session': 1.0, 'day': hours.sum() / 24},
+        'parallel': {'session': parallel / hours.sum(), 'day': parallel / 24}
+    }
+
+def _weights(weights, num_markets):
+    if weights is None:
+        return np.full(num_markets, 1 / num_markets)
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+def simulate_allocation(session_returns, weights=None):
+    """
+    Both allocation schemes on per-session returns
+
+    Args:
+        session_returns: (days, markets) or (scenarios, days, markets)
+                         fractional returns on the capital deployed in
+                         each session
+        weights: Parallel sub-account weights (equal if None)
+
+    Returns:
+        dict: Per-scenario arrays 'sequential_cagr', 'parallel_cagr' (%),
+              'sequential_drawdown', 'parallel_drawdown' (%, max, marked
+              at each session close), 'sequential_return',
+              'parallel_return' (%, total) and 'efficiency' (ratio of
+              ending equity, sequential / parallel)
+    """
+    r = np.asarray(session_returns, dtype=float)
+    if r.ndim == 2:
+        r = r[None]
+    num_scenarios, num_days, num_markets = r.shape
+    weights = _weights(weights, num_markets)
+    growth = 1 + r
+
+    # Sequential: one account through every session, in order
+    sequential = np.cumprod(growth.reshape(num_scenarios, -1), axis=1)
+
+    # Parallel: sub-account m is marked at its own session close; the
+    # others keep their previous close
+    accounts = np.cumprod(growth, axis=1) * weights
+    previous = np.concatenate((np.broadcast_to(weights, (num_scenarios, 1, num_markets)),
+                               accounts[:, :-1]), axis=1)
+    parallel = (np.cumsum(accounts, axis=2)
+                + previous.sum(axis=2, keepdims=True) - np.cumsum(previous, axis=2))
+    parallel = parallel.reshape(num_scenarios, -1)
+
+    years = num_days / TRADING_DAYS_PER_YEAR
+    results = {}
+    for name, equity in (('sequential', sequential), ('parallel', parallel)):
+        running_max = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+        results[f'{name}_drawdown'] = ((equity / running_max) - 1).min(axis=1) * 100
+        results[f'{name}_return'] = (equity[:, -1] - 1) * 100
+        results[f'{name}_cagr'] = (np.maximum(equity[:, -1], 0) ** (1 / years) - 1) * 100
+    with np.errstate(divide='ignore', invalid='ignore'):
+        results['efficiency'] = sequential[:, -1] / parallel[:, -1]
+    return results
+
+def synthetic_session_returns(rng, num_scenarios, num_days, annual_return=EXAMPLE_ANNUAL_RETURN,
+                              daily_vol=EXAMPLE_DAILY_VOL, correlation=EXAMPLE_CORRELATION,
+                              num_markets=len(MARKETS)):
+    """
+    Correlated normal per-session returns, each market compounding to
+    about annual_return a year
+
+    Returns:
+        np.ndarray: (num_scenarios, num_days, num_markets) fractional returns
+    """
+    corr = np.full((num_markets, num_markets), correlation)
+    np.fill_diagonal(corr, 1.0)
+    chol = np.linalg.cholesky(corr) * daily_vol
+    mean = np.log1p(annual_return) / TRADING_DAYS_PER_YEAR + daily_vol ** 2 / 2
+    shocks = rng.standard_normal((num_scenarios, num_days, num_markets))
+    return mean + shocks @ chol.T
+
+def _simulate_task(args):
+    """Worker entry point: generate and simulate one batch of scenarios"""
+    num_scenarios, num_days, seed, weights, params = args
+    rng = np.random.default_rng(seed)
+    return simulate_allocation(
+        synthetic_session_returns(rng, num_scenarios, num_days, **params), weights)
+
+def run_scenarios(num_scenarios=40_000, num_days=TRADING_DAYS_PER_YEAR, weights=None,
+                  seed=0, batch_days=DEFAULT_BATCH_DAYS, max_workers=None, **params):
+    """
+    Simulate many synthetic scenarios in batches across processes
+
+    Every batch gets its own child seed, so results do not depend on the
+    number of processes.
+
+    Args:
+        num_scenarios: Number of scenarios
+        num_days: Trading days per scenario
+        weights: Parallel sub-account weights
+        seed: Root seed
+        batch_days: Scenario-days per batch (bounds memory per worker)
+        **params: synthetic_session_returns() parameters
+
+    Returns:
+        dict: Per-scenario arrays, as simulate_allocation()
+    """
+    batch_size = max(1, batch_days // num_days)
+    batch_sizes = [min(batch_size, num_scenarios - start)
+                   for start in range(0, num_scenarios, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    tasks = [(size, num_days, child, weights, params) for size, child in zip(batch_sizes, seeds)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        batches = list(executor.map(_simulate_task, tasks))
+
+    return {key: np.concatenate([batch[key] for batch in batches]) for key in batches[0]}
+
+def main():
+    """Reproduce the docs example, then simulate 10^7 session-days"""
+
+    parser = argparse.ArgumentParser(description="Sequential vs parallel capital allocation")
+    parser.add_argument('--scenarios', type=int, default=40_000)
+    parser.add_argument('--days', type=int, default=TRADING_DAYS_PER_YEAR)
+    parser.add_argument('--seed', type=int, default=2026)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - SEQUENTIAL VS PARALLEL CAPITAL ALLOCATION")
+    print("=" * 70 + "\n")
+
+    example = simulate_allocation(np.full((1, 3), 0.50))
+    sequential, parallel = example['sequential_return'][0], example['parallel_return'][0]
+    print("DOCS EXAMPLE (+50% in each session, one cycle):")
+    print(f"  Sequential: {sequential:+.1f}%   Parallel: {parallel:+.1f}%   "
+          f"Profit ratio: {sequential / parallel:.2f}x   "
+          f"Efficiency (equity): {example['efficiency'][0]:.2f}x\n")
+
+    usage = utilization()
+    hours = session_hours()
+    print("CAPITAL AT WORK (from SESSIONS hours: "
+          + ", ".join(f"{m} {h:g}h" for m, h in zip(MARKETS, hours)) + "):")
+    for scheme in ('sequential', 'parallel'):
+        print(f"  {scheme.capitalize():<11} {usage[scheme]['session'] * 100:>5.1f}% of session hours "
+              f"(idle {100 - usage[scheme]['session'] * 100:>4.1f}%), "
+              f"{usage[scheme]['day'] * 100:>5.1f}% of the day")
+
+    session_days = args.scenarios * args.days
+    print(f"\nSimulating {args.scenarios:,} scenarios x {args.days} days "
+          f"= {session_days:,} days ({session_days * len(MARKETS):,} sessions), "
+          f"{os.cpu_count() or 1} workers...")
+    start = time.perf_counter()
+    results = run_scenarios(args.scenarios, args.days, seed=args.seed)
+    elapsed = time.perf_counter() - start
+    print(f"Done in {elapsed:.2f}s ({session_days / elapsed:,.0f} days/sec)\n")
+
+    summary = summarize(results)
+    print(f"{'Metric':<26} {'P5':>8} {'P25':>8} {'P50':>8} {'P75':>8} {'P95':>8}")
+    print("-" * 70)
+    for label, key in (('Sequential CAGR (%)', 'sequential_cagr'),
+                       ('Parallel CAGR (%)', 'parallel_cagr'),
+                       ('Sequential max DD (%)', 'sequential_drawdown'),
+                       ('Parallel max DD (%)', 'parallel_drawdown'),
+                       ('Efficiency (x)', 'efficiency')):
+        print(f"{label:<26} " + " ".join(f"{v:>8.1f}" for v in summary[key].values()))
+
+    print("\n" + "=" * 70)
+    print("NOTE: Synthetic example returns - illustrates the allocation mechanics only.")
+    print("=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
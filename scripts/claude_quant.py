@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Claude Quant Command-Line Interface
+===================================
+
+Single entry point for the scripts in this directory:
+
+    verify      Performance verification       (verify_performance.py)
+    visualize   Chart generation               (visualize_performance.py)
+    vix         VIX regime monitor             (vix_monitor.py)
+    risk        Risk framework demo            (risk_simulator.py)
+    sessions    Session sequencing reference   (session_sequencing_reference.py)
+
+Only the module behind the chosen subcommand is imported, so `vix` never
+loads matplotlib and `risk` never loads pandas or yfinance. Everything
+after the subcommand is passed through to that script's own argparse
+parser, which also rejects unknown options (`risk` and `sessions` take
+none).
+
+Usage:
+    python scripts/claude_quant.py verify --force
+    python scripts/claude_quant.py visualize --preview
+    python scripts/claude_quant.py vix --csv data/vix.csv
+    python scripts/claude_quant.py risk
+    python scripts/claude_quant.py sessions
+
+Requirements:
+    (per subcommand - see each script)
+"""
+
+import argparse
+import importlib
+import sys
+
+# Subcommand -> (module, entry function, description)
+COMMANDS = {
+    'verify': ('verify_performance', 'main', "Verify the performance data"),
+    'visualize': ('visualize_performance', 'main', "Generate performance charts"),
+    'vix': ('vix_monitor', 'main', "Show the current VIX regime"),
+    'risk': ('risk_simulator', 'main', "Run the risk framework demo"),
+    'sessions': ('session_sequencing_reference', 'main', "Run the session sequencing demo"),
+}
+
+def build_parser():
+    """Top-level parser; subcommand options are parsed by the subcommand"""
+    parser = argparse.ArgumentParser(
+        prog='claude-quant', description="Claude Quant scripts",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n" + "\n".join(f"  {name:<11} {description}"
+                                        for name, (_, _, description) in COMMANDS.items()))
+    parser.add_argument('command', choices=COMMANDS, metavar='command',
+                        help="One of: " + ", ".join(COMMANDS))
+    parser.add_argument('args', nargs=argparse.REMAINDER,
+                        help="Options for the command (see: claude-quant COMMAND --help)")
+    return parser
+
+def run(command, args=()):
+    """
+    Import the module behind a subcommand and run its entry point
+
+    Args:
+        command: Key of COMMANDS
+        args: Arguments for the subcommand's own parser
+    """
+    module_name, function_name, _ = COMMANDS[command]
+    module = importlib.import_module(module_name)
+    sys.argv = [f'claude-quant {command}'] + list(args)
+    return getattr(module, function_name)()
+
+def main(argv=None):
+    """Dispatch to a subcommand"""
+    args = build_parser().parse_args(argv)
+    run(args.command, args.args)
+
+if __name__ == "__main__":
+    main()
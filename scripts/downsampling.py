@@ -0,0 +1,103 @@
+"""
+Plot Downsampling
+=================
+
+Reduce long series to a few thousand points before handing them to
+matplotlib, while keeping what the eye (and the annotations) care about.
+
+- lttb_indices:   Largest-Triangle-Three-Buckets - keeps the visual shape
+                  of a line (equity, cumulative return)
+- minmax_indices: Min/max envelope - keeps the highest and lowest point
+                  of every bucket (drawdowns, daily return bars)
+
+Both return sorted row indices, so the same selection can be applied to
+dates and to several aligned series. merge_indices() adds rows that must
+survive (first/last row, the annotated max-drawdown point).
+
+Requirements:
+    pip install numpy
+"""
+
+import numpy as np
+
+def lttb_indices(x, y, num_out):
+    """
+    Largest-Triangle-Three-Buckets selection
+
+    The first and last points are always kept. Interior points are split
+    into num_out - 2 buckets; from each bucket the point forming the
+    largest triangle with the previously selected point and the average
+    of the next bucket is kept.
+
+    Args:
+        x: Monotonic x values (e.g. dates as numbers)
+        y: Values
+        num_out: Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted int indices
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if num_out >= n or num_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, num_out - 1).astype(np.int64)
+    selected = np.empty(num_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for i in range(num_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[n - 1], y[n - 1]
+
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+def minmax_indices(y, num_buckets):
+    """
+    Min/max envelope selection
+
+    Keeps the minimum and maximum of each of num_buckets equal-sized
+    buckets, so every extreme of the original series is preserved.
+
+    Returns:
+        np.ndarray: Sorted unique int indices (at most 2 * num_buckets)
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * num_buckets >= n or num_buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // num_buckets)
+    padded_low = np.full(num_buckets * size, np.inf)
+    padded_high = np.full(num_buckets * size, -np.inf)
+    padded_low[:n] = y
+    padded_high[:n] = y
+
+    offsets = np.arange(num_buckets) * size
+    lows = offsets + padded_low.reshape(num_buckets, size).argmin(axis=1)
+    highs = offsets + padded_high.reshape(num_buckets, size).argmax(axis=1)
+
+    indices = np.unique(np.concatenate((lows, highs)))
+    return indices[indices < n]
+
+def merge_indices(*index_sets):
+    """
+    Union of index selections (and individual required rows)
+
+    Returns:
+        np.ndarray: Sorted unique int indices
+    """
+    return np.unique(np.concatenate([np.atleast_1d(np.asarray(ix, dtype=np.int64))
+                                     for ix in index_sets]))
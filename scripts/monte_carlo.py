@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Stress Test
+=======================
+
+Bootstraps daily returns from the backtest and live simulation data
+(each source is its own segment, so no bootstrap block ever mixes the
+two regimes or wraps from the end of the data back to its start),
+applies the RiskFramework VIX sizing and portfolio hard stop, and builds
+distributions of CAGR, maximum drawdown and stop-trigger frequency.
+
+- Vectorized over paths: each batch is a (paths x days) matrix
+- Memory-bounded: only per-path summary statistics are kept, so memory
+  depends on the batch size, not the total number of paths
+- Reproducible: every batch gets its own child seed from one
+  SeedSequence, so results do not depend on the number of processes
+
+Usage:
+    python scripts/monte_carlo.py
+
+Requirements:
+    pip install pandas numpy
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from backtest_replay import BACKTEST_FILE, load_backtest
+from risk_simulator import RiskFramework
+from verify_performance import load_data
+
+LIVE_FILE = 'data/live_simulation_dec3_jan16.csv'
+
+TRADING_DAYS_PER_YEAR = 252
+
+DEFAULT_BATCH_SIZE = 2_000
+
+def load_return_pool(source='both'):
+    """
+    Daily fractional returns to bootstrap from
+
+    Args:
+        source: 'backtest', 'live', or 'both'
+
+    Returns:
+        tuple: (float64 daily returns, tuple of segment lengths - one per
+               source, in order - for bootstrap_indices)
+    """
+    pools = []
+    if source in ('backtest', 'both'):
+        pools.append(load_backtest(BACKTEST_FILE)['portfolio_return_22x'].values)
+    if source in ('live', 'both'):
+        pools.append(load_data(LIVE_FILE)['daily_return_pct'].values / 100)
+    if not pools:
+        raise ValueError(f"Unknown return source: {source}")
+    return np.concatenate(pools).astype(float), tuple(len(pool) for pool in pools)
+
+def bootstrap_indices(rng, num_paths, num_days, pool_size, block_size=1, segments=None):
+    """
+    Index matrix for an iid (block_size=1) or moving block bootstrap
+
+    Block starts are drawn only where the whole block lies inside one
+    segment, so blocks never straddle a junction between data sources
+    or wrap around the end of the pool.
+
+    Args:
+        segments: Lengths of the consecutive segments making up the pool
+                  (one segment of pool_size if None)
+
+    Returns:
+        np.ndarray: int (num_paths x num_days) indices into the pool
+    """
+    if block_size <= 1:
+        return rng.integers(0, pool_size, size=(num_paths, num_days))
+
+    if segments is None:
+        segments = (pool_size,)
+    offsets = np.cumsum((0,) + tuple(segments[:-1]))
+    valid = np.concatenate([offset + np.arange(length - block_size + 1)
+                            for offset, length in zip(offsets, segments)
+                            if length >= block_size] or [np.empty(0, dtype=int)])
+    if len(valid) == 0:
+        raise ValueError(f"No segment holds a block of {block_size} days")
+
+    num_blocks = -(-num_days // block_size)
+    starts = valid[rng.integers(0, len(valid), size=(num_paths, num_blocks, 1))]
+    indices = starts + np.arange(block_size)
+    return indices.reshape(num_paths, num_blocks * block_size)[:, :num_days]
+
+def simulate_batch(returns, num_paths, num_days, seed, block_size=1,
+                   vix_level=None, framework=None, segments=None):
+    """
+    Simulate one batch of bootstrapped paths
+
+    Args:
+        returns: Pool of daily fractional returns
+        num_paths: Paths in this batch
+        num_days: Days per path
+        seed: Seed (int or SeedSequence) for this batch
+        block_size: Bootstrap block length in days (1 = iid)
+        vix_level: Constant VIX level for sizing (None = full size)
+        framework: RiskFramework (default parameters if None)
+        segments: Segment lengths of the pool (see bootstrap_indices)
+
+    Returns:
+        dict: Per-path 'cagr', 'max_drawdown' (%) and 'stop_frequency'
+    """
+    if framework is None:
+        framework = RiskFramework()
+    rng = np.random.default_rng(seed)
+
+    paths = returns[bootstrap_indices(rng, num_paths, num_days, len(returns), block_size,
+                                      segments)]
+
+    if vix_level is not None:
+        multiplier, _ = framework.calculate_position_sizes(1.0, vix_level)
+        paths *= multiplier
+
+    stops = framework.check_portfolio_stops(paths * 100)
+    paths = np.where(stops, framework.daily_loss_limit / 100, paths)
+
+    equity = np.cumprod(1 + paths, axis=1)
+    running_max = np.maximum(np.maximum.accumulate(equity, axis=1), 1.0)
+    max_drawdown = ((equity / running_max) - 1).min(axis=1) * 100
+
+    years = num_days / TRADING_DAYS_PER_YEAR
+    cagr = (np.maximum(equity[:, -1], 0) ** (1 / years) - 1) * 100
+
+    return {
+        'cagr': cagr,
+        'max_drawdown': max_drawdown,
+        'stop_frequency': stops.mean(axis=1)
+    }
+
+def _simulate_task(args):
+    """Worker entry point (top-level so it can be pickled)"""
+    returns, num_paths, num_days, seed, block_size, vix_level, params, segments = args
+    return simulate_batch(returns, num_paths, num_days, seed, block_size,
+                          vix_level, RiskFramework(**params), segments)
+
+def run_monte_carlo(returns, num_paths=100_000, num_days=TRADING_DAYS_PER_YEAR,
+                    block_size=1, vix_level=None, seed=0, framework_params=None,
+                    batch_size=DEFAULT_BATCH_SIZE, max_workers=None, segments=None):
+    """
+    Run the full simulation across processes
+
+    Paths are split into batches of batch_size, each with its own child
+    seed; batches are distributed over a ProcessPoolExecutor and their
+    summaries concatenated in batch order. segments (from
+    load_return_pool) keeps bootstrap blocks inside one data source.
+
+    Returns:
+        dict: Per-path arrays 'cagr', 'max_drawdown', 'stop_frequency'
+    """
+    returns = np.asarray(returns, dtype=float)
+    framework_params = framework_params or {}
+
+    batch_sizes = [min(batch_size, num_paths - start)
+                   for start in range(0, num_paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batch_sizes))
+    tasks = [(returns, size, num_days, child, block_size, vix_level, framework_params, segments)
+             for size, child in zip(batch_sizes, seeds)]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        batches = list(executor.map(_simulate_task, tasks))
+
+    return {key: np.concatenate([batch[key] for batch in batches])
+            for key in ('cagr', 'max_drawdown', 'stop_frequency')}
+
+def summarize(results, percentiles=(5, 25, 50, 75, 95)):
+    """
+    Percentile table for each simulated metric
+
+    Returns:
+        dict: Metric -> {percentile: value}
+    """
+    return {metric: dict(zip(percentiles, np.percentile(values, percentiles)))
+            for metric, values in results.items()}
+
+def main():
+    """Run a 100k-path one-year stress test"""
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - MONTE CARLO STRESS TEST")
+    print("=" * 70 + "\n")
+
+    try:
+        returns, segments = load_return_pool('both')
+    except FileNotFoundError:
+        print("ERROR: Could not find the CSV files in data/")
+        print("Please run this script from the repository root directory.")
+        return
+
+    num_paths = 100_000
+    print(f"Return pool: {len(returns):,} days (backtest + live simulation)")
+    print(f"Simulating {num_paths:,} one-year paths, 5-day block bootstrap, "
+          f"{os.cpu_count() or 1} workers...\n")
+
+    for label, vix in (('Full size', None), ('VIX 25 (elevated)', 25.0)):
+        start = time.perf_counter()
+        results = run_monte_carlo(returns, num_paths=num_paths, block_size=5,
+                                  vix_level=vix, seed=2026, segments=segments)
+        elapsed = time.perf_counter() - start
+        summary = summarize(results)
+
+        print(f"{label.upper()} ({elapsed:.2f}s)")
+        print(f"{'Metric':<22} {'P5':>10} {'P25':>10} {'P50':>10} {'P75':>10} {'P95':>10}")
+        print("-" * 70)
+        print(f"{'CAGR (%)':<22} " + " ".join(f"{v:>10.1f}" for v in summary['cagr'].values()))
+        print(f"{'Max Drawdown (%)':<22} " + " ".join(f"{v:>10.1f}" for v in summary['max_drawdown'].values()))
+        print(f"{'Stop days (%)':<22} " + " ".join(f"{v * 100:>10.2f}" for v in summary['stop_frequency'].values()))
+        print()
+
+    print("=" * 70)
+    print("NOTE: Bootstrapped from historical data - past performance does not")
+    print("guarantee future results.")
+    print("=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Risk Parameter Sweep
+====================
+
+Evaluates a grid or random sample of RiskFramework parameters (daily loss
+limit, VIX thresholds, regime multipliers, expansion factor) against the
+2021-2026 backtest in parallel.
+
+The return series is loaded once and placed in shared memory; worker
+processes attach to it instead of re-reading the CSV. Results stream back
+as chunks complete and are ranked by Sharpe ratio, with Sharpe, Sortino
+and max drawdown computed by verify_performance.calculate_risk_metrics.
+
+NOTE: The backtest CSV has no VIX or Nikkei session columns. The demo
+uses a seeded synthetic VIX path and Nikkei outcomes; pass real series
+to run_sweep() for research runs.
+
+Usage:
+    python scripts/parameter_sweep.py
+
+Requirements:
+    pip install pandas numpy
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory, util
+
+import numpy as np
+import pandas as pd
+
+from backtest_replay import BACKTEST_FILE, load_backtest, replay_backtest
+from risk_simulator import REGIME_NAMES, RiskFramework
+from verify_performance import calculate_risk_metrics
+
+# Example search space (values are illustrative, not production settings)
+DEFAULT_SPACE = {
+    'daily_loss_limit': [-6.0, -7.5, -8.7, -10.0],
+    'vix_low': [13, 15, 17],
+    'vix_normal': [20, 22],
+    'vix_elevated': [28, 30, 35],
+    'mult_normal': [0.7, 0.8, 0.9],
+    'mult_elevated': [0.5, 0.6],
+    'mult_crisis': [0.3, 0.4],
+    'expansion_factor': [1.0, 1.25, 1.5],
+}
+
+# Rows of the shared input block
+_ROW_RETURNS, _ROW_VIX, _ROW_NIKKEI = range(3)
+
+# Framework defaults for thresholds and multipliers a parameter set omits
+_DEFAULTS = RiskFramework()
+
+# Per-worker view of the shared input block (set by _attach_shared_inputs)
+_shared_block = None
+_shared_inputs = None
+
+def grid_parameters(space=DEFAULT_SPACE):
+    """
+    Full Cartesian grid over a search space
+
+    Combinations with unordered VIX thresholds are skipped.
+
+    Returns:
+        list: Parameter dicts
+    """
+    names = list(space)
+    param_sets = [dict(zip(names, values))
+                  for values in itertools.product(*(space[name] for name in names))]
+    return [params for params in param_sets if _valid_thresholds(params)]
+
+def sample_parameters(space=DEFAULT_SPACE, num_samples=500, seed=0):
+    """
+    Random sample from a search space (with replacement per parameter)
+
+    Returns:
+        list: Parameter dicts with ordered VIX thresholds
+    """
+    rng = np.random.default_rng(seed)
+    param_sets = []
+    while len(param_sets) < num_samples:
+        params = {name: values[rng.integers(len(values))]
+                  for name, values in space.items()}
+        if _valid_thresholds(params):
+            param_sets.append(params)
+    return param_sets
+
+def _valid_thresholds(params):
+    """Regime thresholds must be strictly increasing"""
+    low = params.get('vix_low', _DEFAULTS.vix_low)
+    normal = params.get('vix_normal', _DEFAULTS.vix_normal)
+    elevated = params.get('vix_elevated', _DEFAULTS.vix_elevated)
+    return low < normal < elevated
+
+def build_framework(params):
+    """
+    Create a RiskFramework from a flat parameter dict
+
+    Multipliers are given as 'mult_<regime>' keys; missing keys keep the
+    framework defaults.
+    """
+    multipliers = dict(_DEFAULTS.regime_multipliers)
+    for regime in REGIME_NAMES:
+        multipliers[regime] = params.get(f'mult_{regime}', multipliers[regime])
+
+    kwargs = {name: value for name, value in params.items()
+              if not name.startswith('mult_')}
+    return RiskFramework(regime_multipliers=multipliers, **kwargs)
+
+def synthetic_vix(num_days, seed=0, mean=19.0, speed=0.05, vol=0.08):
+    """
+    Seeded mean-reverting (log Ornstein-Uhlenbeck) VIX path for demos
+
+    Returns:
+        np.ndarray: float64 VIX levels
+    """
+    rng = np.random.default_rng(seed)
+    log_vix = np.empty(num_days)
+    log_vix[0] = np.log(mean)
+    shocks = rng.normal(0, vol, size=num_days)
+    for i in range(1, num_days):
+        log_vix[i] = log_vix[i - 1] + speed * (np.log(mean) - log_vix[i - 1]) + shocks[i]
+    return np.exp(log_vix)
+
+def evaluate_parameters(params, returns, vix_levels, nikkei_profitable):
+    """
+    Replay the backtest for one parameter set and score it
+
+    Returns:
+        dict: Parameters plus Sharpe, Sortino, max drawdown, volatility,
+              stop count and final equity multiple
+    """
+    framework = build_framework(params)
+    replay = replay_backtest(returns, framework, vix_levels=vix_levels,
+                             nikkei_profitable=nikkei_profitable)
+
+    metrics = calculate_risk_metrics(
+        pd.DataFrame({'daily_return_pct': replay['portfolio_return_22x'] * 100}))
+
+    result = dict(params)
+    result.update(metrics)
+    result['stops'] = int(replay['stop_triggered'].sum())
+    result['final_equity'] = float(replay['equity_22x'][-1])
+    return result
+
+def _attach_shared_inputs(name, shape):
+    """
+    Worker initializer: map the shared input block as a NumPy view
+
+    The handle is closed when the worker exits; the parent owns the block
+    and unlinks it.
+    """
+    global _shared_block, _shared_inputs
+    _shared_block = shared_memory.SharedMemory(name=name)
+    _shared_inputs = np.ndarray(shape, dtype=np.float64, buffer=_shared_block.buf)
+    # Run by the worker's own shutdown (atexit hooks are skipped in forked workers)
+    util.Finalize(None, _detach_shared_inputs, exitpriority=0)
+
+def _detach_shared_inputs():
+    """Drop the worker's view and close its shared-memory handle"""
+    global _shared_block, _shared_inputs
+    _shared_inputs = None
+    _shared_block.close()
+    _shared_block = None
+
+def _evaluate_chunk(param_sets):
+    """Worker task: evaluate a chunk of parameter sets on the shared inputs"""
+    returns = _shared_inputs[_ROW_RETURNS]
+    vix_levels = _shared_inputs[_ROW_VIX]
+    nikkei_profitable = _shared_inputs[_ROW_NIKKEI] > 0
+    return [evaluate_parameters(params, returns, vix_levels, nikkei_profitable)
+            for params in param_sets]
+
+def run_sweep(param_sets, returns, vix_levels, nikkei_profitable,
+              max_workers=None, chunk_size=16):
+    """
+    Evaluate parameter sets in parallel, yielding results as they finish
+
+    Args:
+        param_sets: List of parameter dicts
+        returns: Daily portfolio returns (fractional)
+        vix_levels: VIX level per day
+        nikkei_profitable: Boolean Nikkei outcome per day
+        max_workers: Process count (os.cpu_count() if None)
+        chunk_size: Parameter sets per task
+
+    Yields:
+        dict: One result per parameter set, in completion order
+    """
+    inputs = np.vstack([
+        np.asarray(returns, dtype=float),
+        np.asarray(vix_levels, dtype=float),
+        np.asarray(nikkei_profitable, dtype=float),
+    ])
+
+    block = shared_memory.SharedMemory(create=True, size=inputs.nbytes)
+    try:
+        np.ndarray(inputs.shape, dtype=np.float64, buffer=block.buf)[:] = inputs
+
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_attach_shared_inputs,
+                                 initargs=(block.name, inputs.shape)) as executor:
+            futures = [executor.submit(_evaluate_chunk, param_sets[i:i + chunk_size])
+                       for i in range(0, len(param_sets), chunk_size)]
+            for future in as_completed(futures):
+                yield from future.result()
+    finally:
+        block.close()
+        block.unlink()
+
+def rank_results(results, key='sharpe_ratio', ascending=False):
+    """
+    Rank sweep results into a table
+
+    Returns:
+        pd.DataFrame: Results sorted by key, best first
+    """
+    table = pd.DataFrame(results)
+    if table.empty:
+        return table
+    return table.sort_values(key, ascending=ascending).reset_index(drop=True)
+
+def main():
+    """Run an example sweep over the backtest"""
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - RISK PARAMETER SWEEP")
+    print("=" * 70 + "\n")
+
+    try:
+        df = load_backtest()
+    except FileNotFoundError:
+        print(f"ERROR: Could not find {BACKTEST_FILE}")
+        print("Please run this script from the repository root directory.")
+        return
+
+    returns = df['portfolio_return_22x'].values
+    vix_levels = synthetic_vix(len(returns), seed=42)
+    nikkei_profitable = np.random.default_rng(42).random(len(returns)) < 0.55
+
+    param_sets = grid_parameters()
+    workers = os.cpu_count() or 1
+    print(f"Evaluating {len(param_sets):,} parameter sets on {workers} workers...\n")
+
+    results = []
+    start = time.perf_counter()
+    for result in run_sweep(param_sets, returns, vix_levels, nikkei_profitable):
+        results.append(result)
+        if len(results) % 500 == 0:
+            best = max(r['sharpe_ratio'] for r in results)
+            print(f"  {len(results):>6,} / {len(param_sets):,} done "
+                  f"(best Sharpe so far: {best:.2f})")
+    elapsed = time.perf_counter() - start
+
+    table = rank_results(results)
+    columns = list(DEFAULT_SPACE) + ['sharpe_ratio', 'sortino_ratio', 'max_drawdown', 'stops']
+
+    print(f"\nCompleted in {elapsed:.2f}s "
+          f"({len(results) / elapsed:,.0f} parameter sets/sec)\n")
+    print("TOP 10 BY SHARPE RATIO:")
+    print(table[columns].head(10).to_string(index=False, float_format=lambda x: f'{x:.2f}'))
+
+    print("\n" + "=" * 70)
+    print("NOTE: Uses a synthetic VIX path and Nikkei outcomes - results are")
+    print("illustrative only.")
+    print("=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Report Cache
+============
+
+Content-addressed cache that lets visualize_performance.py and
+verify_performance.py skip work when their inputs have not changed.
+
+- fingerprint(): hash of a DataFrame's rows plus the parameters of the
+  output being produced; an output whose recorded key matches (and whose
+  file still exists) is skipped
+- load_result()/save_result(): computed results stored by key
+- load_prefix()/save_prefix(): state for append-only data. The state is
+  stored with a hash of the rows it was computed from; when new data
+  starts with exactly those rows, the cached state is returned so only
+  the appended tail needs computing
+
+Everything lives under .report_cache/ (delete it, or pass --force to the
+scripts, to rebuild from scratch).
+
+Requirements:
+    pip install pandas numpy
+"""
+
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = '.report_cache'
+
+# Bump to invalidate every cached output after changing how reports are built
+CACHE_VERSION = 1
+
+def _digest_arrays(arrays):
+    """Hash a sequence of NumPy arrays (dtype, shape and bytes)"""
+    h = hashlib.blake2b(digest_size=20)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        h.update(f"{array.dtype.str}{array.shape}".encode())
+        h.update(array.view(np.uint8).ravel())
+    return h.hexdigest()
+
+class ReportCache:
+    """Fingerprint-keyed store for outputs, results and append-only state"""
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.manifest_file = os.path.join(cache_dir, 'manifest.json')
+        os.makedirs(os.path.join(cache_dir, 'results'), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, 'state'), exist_ok=True)
+        self._manifest = self._read_manifest()
+
+    def fingerprint(self, df, params=None):
+        """
+        Key for a DataFrame's rows plus output parameters
+
+        Dates are hashed as int64 nanoseconds, other columns as float64.
+        """
+        arrays = []
+        for column in df.columns:
+            values = df[column].to_numpy()
+            if np.issubdtype(values.dtype, np.datetime64):
+                values = values.astype('datetime64[ns]').view(np.int64)
+            else:
+                values = values.astype(np.float64)
+            arrays.append(values)
+
+        header = json.dumps({'version': CACHE_VERSION, 'columns': list(df.columns),
+                             'params': params or {}}, sort_keys=True, default=str)
+        return _digest_arrays([np.frombuffer(header.encode(), dtype=np.uint8)] + arrays)
+
+    def derive_key(self, base_key, params):
+        """Key for an output derived from already-fingerprinted data"""
+        payload = json.dumps({'base': base_key, 'params': params}, sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+    # Output files -----------------------------------------------------------
+
+    def is_current(self, output_file, key):
+        """Whether output_file exists and was produced from this key"""
+        return (self._manifest.get(os.path.abspath(output_file)) == key
+                and os.path.exists(output_file))
+
+    def record(self, output_file, key):
+        """Remember that output_file was produced from key"""
+        self._manifest[os.path.abspath(output_file)] = key
+        tmp_file = f"{self.manifest_file}.tmp-{os.getpid()}"
+        with open(tmp_file, 'w') as f:
+            json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, self.manifest_file)
+
+    # Computed results -------------------------------------------------------
+
+    def load_result(self, key):
+        """Cached result for key, or None"""
+        try:
+            with open(self._result_path(key), 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def save_result(self, key, result):
+        """Store a result under key"""
+        with open(self._result_path(key), 'wb') as f:
+            pickle.dump(result, f)
+
+    # Append-only state ------------------------------------------------------
+
+    def load_prefix(self, name, rows):
+        """
+        Cached state for a prefix of rows
+
+        Args:
+            name: State name
+            rows: Current input rows (1-D array)
+
+        Returns:
+            dict or None: Stored arrays if their source rows are exactly the
+                          first len(source) rows of `rows`
+        """
+        path = self._state_path(name)
+        try:
+            with np.load(path) as state:
+                arrays = {key: state[key] for key in state.files}
+        except (OSError, ValueError):
+            return None
+
+        num_rows = int(arrays.pop('_num_rows'))
+        digest = str(arrays.pop('_digest'))
+        if num_rows > len(rows) or _digest_arrays([rows[:num_rows]]) != digest:
+            return None
+        return arrays
+
+    def save_prefix(self, name, rows, arrays):
+        """Store state computed from rows"""
+        np.savez(self._state_path(name), _num_rows=len(rows),
+                 _digest=_digest_arrays([rows]), **arrays)
+
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _result_path(self, key):
+        return os.path.join(self.cache_dir, 'results', f'{key}.pkl')
+
+    def _state_path(self, name):
+        return os.path.join(self.cache_dir, 'state', f'{name}.npz')
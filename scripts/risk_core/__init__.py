@@ -0,0 +1,56 @@
+"""
+Risk Core
+=========
+
+Shared risk primitives for the scripts in this directory, so regime
+classification and multipliers live in exactly one place.
+
+- risk_core.regimes: VIX regime thresholds, the RiskFramework and
+  VIXMonitor multiplier tables (precompiled RegimeTable objects) and
+  the backwardation multiplier
+- risk_core.correlation: EW covariance/correlation across NKD, FDAX and
+  NQ and the cross-market exposure cap (CorrelationLimits)
+- risk_core.markets: market and direction codes (MARKET_NAMES,
+  DIRECTION_NAMES)
+
+Submodules are pure Python and load on first attribute access, so
+`import risk_core` costs almost nothing and never pulls in pandas,
+yfinance or matplotlib. NumPy is imported only by the batch methods.
+
+Usage:
+    from risk_core import FRAMEWORK_TABLE
+    multiplier = FRAMEWORK_TABLE.multiplier(vix_level)
+"""
+
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'REGIME_NAMES': 'regimes',
+    'VIX_THRESHOLDS': 'regimes',
+    'FRAMEWORK_MULTIPLIERS': 'regimes',
+    'MONITOR_MULTIPLIERS': 'regimes',
+    'BACKWARDATION_MULTIPLIER': 'regimes',
+    'RegimeTable': 'regimes',
+    'FRAMEWORK_TABLE': 'regimes',
+    'MONITOR_TABLE': 'regimes',
+    'MARKETS': 'correlation',
+    'MAX_CORRELATED_EXPOSURE': 'correlation',
+    'EWCovariance': 'correlation',
+    'CorrelationLimits': 'correlation',
+    'MARKET_NAMES': 'markets',
+    'DIRECTION_NAMES': 'markets',
+}
+
+__all__ = sorted(_EXPORTS)
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'{__name__}.{module_name}'), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
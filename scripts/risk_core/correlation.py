@@ -0,0 +1,289 @@
+"""
+Cross-Market Correlation Limits
+===============================
+
+Layer-1 correlation limits: an exponentially weighted covariance of
+NKD, FDAX and NQ returns, and a cap on the day's correlated exposure.
+
+EWCovariance is updated once per bar in O(k^2) - the running mean and
+covariance absorb the new returns, nothing is recomputed from history.
+update_batch() gives the same matrices for a whole return history with
+array operations (for backtest replay).
+
+Sessions run one after another, so positions never overlap, but every
+session of a day shares the daily loss limit. The exposure of a day is
+therefore measured over the sizes already taken that day:
+
+    exposure = sqrt(w' R w)    (w: signed sizes, % of portfolio)
+
+Uncorrelated markets add like independent risks, perfectly correlated
+same-direction positions add linearly, and opposite positions in
+correlated markets offset. CorrelationLimits caps a new order so the
+day's exposure stays at or below max_exposure - e.g. Nikkei long and
+DAX long shrink the Nasdaq long limit, more so when correlations spike.
+
+NOTE: The cap, half-life and prior are example values (production
+values proprietary).
+"""
+
+import math
+
+from .markets import MARKET_NAMES
+
+# Market order = market code (NKD, FDAX, NQ)
+MARKETS = MARKET_NAMES
+
+# Example values
+MAX_CORRELATED_EXPOSURE = 7.0   # % of portfolio
+DEFAULT_HALFLIFE = 20           # bars
+MIN_BARS = 20                   # bars before the estimate replaces the prior
+PRIOR_CORRELATION = 0.5         # assumed pairwise correlation until then
+
+# Largest decay factor growth within one block of update_batch (bounds the
+# rounding error of the blocked recursion)
+_MAX_BLOCK_GROWTH = 1e4
+
+class EWCovariance:
+    """
+    Exponentially weighted mean and covariance, updated one bar at a time
+
+    With alpha = 1 - 0.5 ** (1 / halflife) and d = x - mean:
+        mean += alpha * d
+        cov   = (1 - alpha) * (cov + alpha * d d')
+    """
+
+    __slots__ = ('size', 'alpha', 'mean', 'cov', 'bars')
+
+    def __init__(self, size: int = len(MARKETS), halflife: float = DEFAULT_HALFLIFE):
+        """
+        Args:
+            size: Number of return series
+            halflife: Weight half-life in bars
+        """
+        self.size = size
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.mean = [0.0] * size
+        self.cov = [[0.0] * size for _ in range(size)]
+        self.bars = 0
+
+    def update(self, returns) -> None:
+        """Absorb one bar of returns (one value per series)"""
+        alpha = self.alpha
+        decay = 1 - alpha
+        mean = self.mean
+        diff = [x - m for x, m in zip(returns, mean)]
+        for i in range(self.size):
+            mean[i] += alpha * diff[i]
+            row = self.cov[i]
+            scaled = alpha * diff[i]
+            for j in range(self.size):
+                row[j] = decay * (row[j] + scaled * diff[j])
+        self.bars += 1
+
+    def correlation(self, prior: float = PRIOR_CORRELATION, min_bars: int = MIN_BARS):
+        """
+        Correlation matrix as nested tuples
+
+        The prior is used until min_bars bars have been seen, and for any
+        series whose variance is still zero.
+        """
+        size = self.size
+        if self.bars < min_bars:
+            return tuple(tuple(1.0 if i == j else prior for j in range(size))
+                         for i in range(size))
+        vols = [math.sqrt(self.cov[i][i]) for i in range(size)]
+        return tuple(
+            tuple(1.0 if i == j else
+                  (self.cov[i][j] / (vols[i] * vols[j]) if vols[i] and vols[j] else prior)
+                  for j in range(size))
+            for i in range(size))
+
+    def update_batch(self, returns):
+        """
+        Absorb many bars with array operations
+
+        Same result as calling update() per row (to rounding): the
+        recursion is run on the raw moments E[x] and E[xx'], which are
+        linear filters and are solved in closed form block by block.
+
+        Args:
+            returns: (n, size) array, one row per bar
+
+        Returns:
+            np.ndarray: (n, size, size) covariance after each bar
+        """
+        import numpy as np
+        x = np.asarray(returns, dtype=float)
+        if len(x) == 0:
+            return np.empty((0, self.size, self.size))
+
+        mean = np.array(self.mean)
+        first = _ew_filter(x, mean, self.alpha)
+        second = _ew_filter(x[:, :, None] * x[:, None, :],
+                            np.array(self.cov) + np.outer(mean, mean), self.alpha)
+        covs = second - first[:, :, None] * first[:, None, :]
+
+        self.mean = first[-1].tolist()
+        self.cov = covs[-1].tolist()
+        self.bars += len(x)
+        return covs
+
+def _ew_filter(u, initial, alpha):
+    """
+    y[t] = (1 - alpha) * y[t-1] + alpha * u[t] with y[-1] = initial
+
+    Within a block, y[t] = decay^(t+1) y0 + alpha decay^t sum_s decay^-s u[s];
+    blocks are short enough that decay^-s stays below _MAX_BLOCK_GROWTH.
+    """
+    import numpy as np
+    decay = 1 - alpha
+    block = max(1, int(math.log(_MAX_BLOCK_GROWTH) / -math.log(decay))) if decay > 0 else 1
+    out = np.empty_like(u)
+    state = np.asarray(initial, dtype=float)
+    shape = (-1,) + (1,) * (u.ndim - 1)
+    for start in range(0, len(u), block):
+        chunk = u[start:start + block]
+        steps = np.arange(len(chunk))
+        sums = np.cumsum(chunk * (decay ** -steps).reshape(shape), axis=0)
+        out[start:start + len(chunk)] = ((decay ** (steps + 1)).reshape(shape) * state
+                                         + alpha * (decay ** steps).reshape(shape) * sums)
+        state = out[start + len(chunk) - 1]
+    return out
+
+class CorrelationLimits:
+    """
+    Caps new orders so the day's correlated exposure stays within a limit
+
+    Exposures are dicts of market -> signed size (% of portfolio,
+    positive long) for the sessions already traded today.
+    """
+
+    __slots__ = ('estimator', 'max_exposure', 'prior', 'min_bars', 'markets', '_codes')
+
+    def __init__(self, max_exposure: float = MAX_CORRELATED_EXPOSURE,
+                 halflife: float = DEFAULT_HALFLIFE, min_bars: int = MIN_BARS,
+                 prior_correlation: float = PRIOR_CORRELATION, markets=MARKETS):
+        """
+        Args:
+            max_exposure: Cap on sqrt(w' R w) (% of portfolio)
+            halflife: Correlation half-life in bars
+            min_bars: Bars before the estimate replaces the prior
+            prior_correlation: Pairwise correlation assumed until then
+            markets: Market names, in return-column order
+        """
+        self.markets = tuple(markets)
+        self._codes = {market: i for i, market in enumerate(self.markets)}
+        self.estimator = EWCovariance(len(self.markets), halflife)
+        self.max_exposure = max_exposure
+        self.prior = prior_correlation
+        self.min_bars = min_bars
+
+    def update(self, returns) -> None:
+        """Absorb one bar of returns (one value per market, in market order)"""
+        self.estimator.update(returns)
+
+    def correlation(self):
+        """Current correlation matrix (nested tuples, market order)"""
+        return self.estimator.correlation(self.prior, self.min_bars)
+
+    def exposure(self, exposures: dict) -> float:
+        """Correlated exposure sqrt(w' R w) of signed sizes by market"""
+        corr = self.correlation()
+        w = [exposures.get(market, 0.0) for market in self.markets]
+        total = sum(w[i] * corr[i][j] * w[j]
+                    for i in range(len(w)) for j in range(len(w)))
+        return math.sqrt(max(total, 0.0))
+
+    def max_size(self, market: str, direction: str, exposures: dict) -> float:
+        """
+        Largest size for an order that keeps the day within the cap
+
+        Solves s^2 + 2 b s + c <= cap^2 for the order size s, where
+        b = sign * R[m] . w and c = w' R w over the other markets. If the
+        other markets already exceed the cap, only orders that reduce
+        the exposure (hedges, s <= -2b) are allowed.
+
+        Args:
+            market: Market of the new order
+            direction: 'long' or 'short'
+            exposures: Signed sizes already taken today; any entry for
+                       this market is replaced by the new order
+
+        Returns:
+            float: Maximum size (% of portfolio, >= 0)
+        """
+        corr = self.correlation()
+        m = self._codes[market]
+        sign = 1.0 if direction == 'long' else -1.0
+        w = [0.0 if i == m else exposures.get(name, 0.0)
+             for i, name in enumerate(self.markets)]
+        b = sign * sum(corr[m][j] * w[j] for j in range(len(w)))
+        c = sum(w[i] * corr[i][j] * w[j] for i in range(len(w)) for j in range(len(w)))
+        disc = b * b - c + self.max_exposure ** 2
+        if disc < 0:
+            return max(0.0, -2 * b)
+        return max(0.0, -b + math.sqrt(disc))
+
+    def cap(self, market: str, direction: str, size: float, exposures: dict) -> float:
+        """Order size reduced to max_size() if needed"""
+        return min(size, self.max_size(market, direction, exposures))
+
+    def correlation_path(self, returns):
+        """
+        Correlation available before each bar, for backtest replay
+
+        Row t uses bars 0..t-1 only (no look-ahead). The estimator ends
+        in the same state as after update() on every row.
+
+        Args:
+            returns: (n, k) array of returns, columns in market order
+
+        Returns:
+            np.ndarray: (n, k, k) correlation matrices
+        """
+        import numpy as np
+        k = len(self.markets)
+        bars_before = self.estimator.bars + np.arange(len(returns))
+        before = np.concatenate((np.array(self.estimator.cov)[None],
+                                 self.estimator.update_batch(returns)[:-1]))[:len(returns)]
+
+        vols = np.sqrt(np.einsum('tii->ti', before))
+        denom = vols[:, :, None] * vols[:, None, :]
+        prior = np.full((k, k), self.prior)
+        np.fill_diagonal(prior, 1.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.where(denom > 0, before / denom, prior)
+        corr[bars_before < self.min_bars] = prior
+        idx = np.arange(k)
+        corr[:, idx, idx] = 1.0
+        return corr
+
+    def cap_batch(self, sizes, correlations):
+        """
+        Vectorized cap for replay: sessions in market order, all days at once
+
+        Each day's sessions are capped one after another (Nikkei, then
+        DAX given Nikkei, then Nasdaq given both), exactly as repeated
+        cap() calls with the day's exposures.
+
+        Args:
+            sizes: (n, k) signed requested sizes (% of portfolio, 0 = no trade)
+            correlations: (n, k, k) matrices, e.g. from correlation_path()
+
+        Returns:
+            np.ndarray: (n, k) signed capped sizes
+        """
+        import numpy as np
+        requested = np.asarray(sizes, dtype=float)
+        corr = np.asarray(correlations, dtype=float)
+        capped = np.zeros_like(requested)
+        for m in range(requested.shape[1]):
+            sign = np.sign(requested[:, m])
+            b = sign * np.einsum('tj,tj->t', corr[:, m, :], capped)
+            c = np.einsum('ti,tij,tj->t', capped, corr, capped)
+            disc = b * b - c + self.max_exposure ** 2
+            with np.errstate(invalid='ignore'):
+                limit = np.where(disc < 0, np.maximum(0.0, -2 * b),
+                                 np.maximum(0.0, -b + np.sqrt(np.maximum(disc, 0.0))))
+            capped[:, m] = sign * np.minimum(np.abs(requested[:, m]), limit)
+        return capped
@@ -0,0 +1,13 @@
+"""
+Market and Direction Codes
+==========================
+
+Integer codes for the traded sessions and directions, shared by the
+order path (pretrade_check), the correlation limits and the session
+ledger. A code is the name's index in these tuples.
+"""
+
+# Session order = market code (NKD, FDAX, NQ)
+MARKET_NAMES = ('nikkei', 'dax', 'nasdaq')
+
+DIRECTION_NAMES = ('long', 'short')
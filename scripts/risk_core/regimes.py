@@ -0,0 +1,93 @@
+"""
+VIX Regime Tables
+=================
+
+One definition of the VIX regimes used across the framework.
+
+Regimes are integer codes in threshold order (0=low, 1=normal,
+2=elevated, 3=crisis). A RegimeTable holds the thresholds and one
+multiplier per regime as tuples, so classification is a single bisect
+and the multiplier a tuple index.
+
+Two example multiplier sets exist and both are kept here:
+- FRAMEWORK_TABLE: RiskFramework's layer-2 sizing (1.0/0.8/0.6/0.4)
+- MONITOR_TABLE:   VIXMonitor's sizing (1.0/0.85/0.65/0.4), which the
+                   monitor further scales by BACKWARDATION_MULTIPLIER
+                   when VIX > VIX3M
+
+NOTE: Thresholds 15/20/30 are standard market levels; the multipliers
+are example values (production values proprietary).
+"""
+
+from bisect import bisect_right
+
+REGIME_NAMES = ('low', 'normal', 'elevated', 'crisis')
+
+# Lower bounds of normal, elevated and crisis (each bound is inclusive)
+VIX_THRESHOLDS = (15, 20, 30)
+
+FRAMEWORK_MULTIPLIERS = (1.00, 0.80, 0.60, 0.40)
+MONITOR_MULTIPLIERS = (1.00, 0.85, 0.65, 0.40)
+
+# Additional reduction when VIX > VIX3M (backwardation)
+BACKWARDATION_MULTIPLIER = 0.75
+
+class RegimeTable:
+    """Precompiled thresholds and per-regime multipliers"""
+
+    __slots__ = ('thresholds', 'multipliers')
+
+    def __init__(self, thresholds=VIX_THRESHOLDS, multipliers=FRAMEWORK_MULTIPLIERS):
+        """
+        Args:
+            thresholds: Ascending lower bounds of regimes 1..n-1
+            multipliers: One multiplier per regime (len(thresholds) + 1),
+                         or a dict of regime name -> multiplier
+        """
+        if isinstance(multipliers, dict):
+            multipliers = [multipliers[name] for name in REGIME_NAMES]
+        self.thresholds = tuple(thresholds)
+        self.multipliers = tuple(float(m) for m in multipliers)
+        if len(self.multipliers) != len(self.thresholds) + 1:
+            raise ValueError(f"Expected {len(self.thresholds) + 1} multipliers, "
+                             f"got {len(self.multipliers)}")
+
+    def code(self, vix_level: float) -> int:
+        """Regime code for a VIX level"""
+        return bisect_right(self.thresholds, vix_level)
+
+    def name(self, vix_level: float) -> str:
+        """Regime name for a VIX level"""
+        return REGIME_NAMES[bisect_right(self.thresholds, vix_level)]
+
+    def multiplier(self, vix_level: float) -> float:
+        """Position size multiplier for a VIX level"""
+        return self.multipliers[bisect_right(self.thresholds, vix_level)]
+
+    def as_dict(self) -> dict:
+        """Regime name -> multiplier"""
+        return dict(zip(REGIME_NAMES, self.multipliers))
+
+    def threshold_dict(self) -> dict:
+        """Regime name -> its upper bound, in the VIX_THRESHOLDS dict layout"""
+        return dict(zip(REGIME_NAMES, self.thresholds))
+
+    def codes(self, vix_levels):
+        """
+        Vectorized regime codes
+
+        Returns:
+            np.ndarray: int8 codes, same buckets as code()
+        """
+        import numpy as np
+        vix = np.asarray(vix_levels, dtype=float)
+        return np.searchsorted(np.asarray(self.thresholds, dtype=float), vix,
+                               side='right').astype(np.int8)
+
+    def multiplier_array(self):
+        """Multipliers as a float64 array indexed by regime code"""
+        import numpy as np
+        return np.array(self.multipliers, dtype=float)
+
+FRAMEWORK_TABLE = RegimeTable(VIX_THRESHOLDS, FRAMEWORK_MULTIPLIERS)
+MONITOR_TABLE = RegimeTable(VIX_THRESHOLDS, MONITOR_MULTIPLIERS)
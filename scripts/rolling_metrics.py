@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Rolling Risk Metrics
+====================
+
+Rolling Sharpe, Sortino, volatility and drawdown series for monitoring,
+computed the same way as verify_performance.calculate_risk_metrics
+(sample standard deviation, 0.018% daily risk-free rate, sqrt(252)
+annualization) but over trailing 20/60/252-day windows.
+
+Every metric is O(n) regardless of the window length:
+- Means and variances come from cumulative sums of x and x^2 (on
+  mean-centered data for numerical stability)
+- Sortino uses cumulative sums restricted to negative returns
+- The trailing equity peak (in log space, so long series cannot
+  overflow) uses the van Herk/Gil-Werman block algorithm,
+  a vectorized equivalent of a monotonic-deque sliding maximum;
+  RollingMax is the deque form for streaming updates
+
+All arrays are aligned with the input: entry i covers the window ending
+at row i, and the first window-1 entries are NaN.
+
+Usage:
+    python scripts/rolling_metrics.py
+
+Requirements:
+    pip install pandas numpy
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from backtest_replay import BACKTEST_FILE, load_backtest
+from verify_performance import LIVE_DATA_FILE, RISK_FREE_DAILY, load_data
+
+DEFAULT_WINDOWS = (20, 60, 252)
+
+ANNUALIZATION = np.sqrt(252)
+
+def _window_sums(values, window):
+    """
+    Sum of each trailing window via a cumulative sum
+
+    Returns:
+        np.ndarray: Length len(values) - window + 1
+    """
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    return cumulative[window:] - cumulative[:-window]
+
+def _aligned(values, n, window):
+    """Left-pad a per-window result with NaN to align it with the input"""
+    out = np.full(n, np.nan)
+    out[window - 1:] = values
+    return out
+
+def rolling_mean_std(returns, window):
+    """
+    Trailing mean and sample standard deviation (ddof=1)
+
+    Returns:
+        tuple: (mean, std) arrays, each of length len(window sums)
+    """
+    centered = returns - returns.mean()
+    sums = _window_sums(centered, window)
+    sq_sums = _window_sums(centered * centered, window)
+    variance = (sq_sums - sums * sums / window) / (window - 1)
+    return sums / window + returns.mean(), np.sqrt(np.maximum(variance, 0.0))
+
+def rolling_downside_std(returns, window):
+    """
+    Trailing sample standard deviation of the negative returns only
+
+    Windows with fewer than two negative returns are NaN, matching
+    pandas' std() on a short downside series.
+    """
+    negative = returns < 0
+    downside = np.where(negative, returns, 0.0)
+    shift = downside[negative].mean() if negative.any() else 0.0
+    centered = np.where(negative, downside - shift, 0.0)
+
+    counts = _window_sums(negative.astype(float), window)
+    sums = _window_sums(centered, window)
+    sq_sums = _window_sums(centered * centered, window)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (sq_sums - sums * sums / counts) / (counts - 1)
+    variance = np.where(counts >= 2, np.maximum(variance, 0.0), np.nan)
+    return np.sqrt(variance)
+
+def rolling_max(values, window):
+    """
+    Trailing maximum in O(n) (van Herk/Gil-Werman)
+
+    The series is split into blocks of `window`; each trailing window
+    spans at most two blocks, so its maximum is the max of a suffix
+    maximum of one block and a prefix maximum of the next.
+
+    Returns:
+        np.ndarray: Length len(values) - window + 1
+    """
+    n = len(values)
+    num_blocks = -(-n // window)
+    padded = np.full(num_blocks * window, -np.inf)
+    padded[:n] = values
+    blocks = padded.reshape(num_blocks, window)
+
+    prefix = np.maximum.accumulate(blocks, axis=1).ravel()
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    ends = np.arange(window - 1, n)
+    return np.maximum(suffix[ends - window + 1], prefix[ends])
+
+class RollingMax:
+    """
+    Monotonic-deque sliding maximum for streaming updates
+
+    Each push is amortized O(1).
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self._deque = deque()   # (index, value), values decreasing
+        self._index = 0
+
+    def push(self, value):
+        """Add a value and return the maximum of the trailing window"""
+        while self._deque and self._deque[-1][1] <= value:
+            self._deque.pop()
+        self._deque.append((self._index, value))
+        if self._deque[0][0] <= self._index - self.window:
+            self._deque.popleft()
+        self._index += 1
+        return self._deque[0][1]
+
+def rolling_metrics(returns, window):
+    """
+    Rolling risk metrics for one window length
+
+    Args:
+        returns: Daily fractional returns
+        window: Trailing window in days
+
+    Returns:
+        dict: 'sharpe_ratio', 'sortino_ratio', 'volatility' (% annualized)
+              and 'drawdown' (% below the trailing-window equity peak),
+              each aligned with returns
+    """
+    returns = np.asarray(returns, dtype=float)
+    n = len(returns)
+    if n < window:
+        empty = np.full(n, np.nan)
+        return {key: empty.copy() for key in
+                ('sharpe_ratio', 'sortino_ratio', 'volatility', 'drawdown')}
+
+    mean, std = rolling_mean_std(returns, window)
+    downside_std = rolling_downside_std(returns, window)
+    excess = mean - RISK_FREE_DAILY
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = excess / std * ANNUALIZATION
+        sortino = excess / downside_std * ANNUALIZATION
+
+    # Work in log equity so multi-million-row series cannot overflow
+    log_equity = np.cumsum(np.log1p(returns))
+    log_peak = rolling_max(log_equity, window)
+    drawdown = np.expm1(log_equity[window - 1:] - log_peak) * 100
+
+    return {
+        'sharpe_ratio': _aligned(sharpe, n, window),
+        'sortino_ratio': _aligned(sortino, n, window),
+        'volatility': _aligned(std * ANNUALIZATION * 100, n, window),
+        'drawdown': _aligned(drawdown, n, window)
+    }
+
+def rolling_metrics_all(returns, windows=DEFAULT_WINDOWS):
+    """
+    Rolling metrics for several windows
+
+    Returns:
+        dict: window -> rolling_metrics() result
+    """
+    return {window: rolling_metrics(returns, window) for window in windows}
+
+def benchmark_rolling(num_rows=5_000_000, windows=DEFAULT_WINDOWS, seed=0):
+    """
+    Time rolling_metrics_all on a synthetic return series
+
+    Returns:
+        dict: Row count and elapsed seconds per window
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0005, 0.02, size=num_rows)
+
+    timings = {}
+    for window in windows:
+        start = time.perf_counter()
+        rolling_metrics(returns, window)
+        timings[window] = time.perf_counter() - start
+    return {'num_rows': num_rows, 'timings': timings}
+
+def main():
+    """Show the latest rolling metrics and run the benchmark"""
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - ROLLING RISK METRICS")
+    print("=" * 70 + "\n")
+
+    try:
+        series = [
+            ('Backtest 2021-2026', load_backtest(BACKTEST_FILE)['portfolio_return_22x'].values),
+            ('Live simulation', load_data(LIVE_DATA_FILE)['daily_return_pct'].values / 100),
+        ]
+    except FileNotFoundError:
+        print("ERROR: Could not find the CSV files in data/")
+        print("Please run this script from the repository root directory.")
+        return
+
+    for label, returns in series:
+        print(f"{label.upper()} ({len(returns)} days) - latest values")
+        print(f"{'Window':<8} {'Sharpe':>9} {'Sortino':>9} {'Vol (%)':>9} {'DD (%)':>9}")
+        print("-" * 70)
+        for window, metrics in rolling_metrics_all(returns).items():
+            latest = [metrics[key][-1] for key in
+                      ('sharpe_ratio', 'sortino_ratio', 'volatility', 'drawdown')]
+            print(f"{window:<8} " + " ".join(f"{value:>9.2f}" for value in latest))
+        print()
+
+    results = benchmark_rolling()
+    print(f"BENCHMARK ({results['num_rows']:,} synthetic rows):")
+    for window, elapsed in results['timings'].items():
+        print(f"  {window:>3}-day window: {elapsed * 1000:8.1f} ms "
+              f"({results['num_rows'] / elapsed:,.0f} rows/sec)")
+
+    print("\n" + "=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Columnar Series Store
+=====================
+
+Compact binary storage for the performance series, so scripts stop
+re-parsing CSV text and inferring dates on every run.
+
+A store is a directory (<name>-<path hash>.cqs under
+.report_cache/series/) holding:
+- meta.json           column names, row count, source file, and the
+                      source's size and mtime when it was converted
+- col<i>.npy          one file per CSV column, in CSV order: 'date' as
+                      datetime64 at the resolution it was parsed with
+                      (intraday timestamps are kept), numeric columns
+                      with their parsed dtype
+
+Each column is a plain .npy file, so load_series() memory-maps it and
+returns zero-copy NumPy views. Files with a text column (or tz-aware
+dates) are not stored - they are read from the CSV every time - so a
+load returns the same frame whether or not a store exists.
+
+load_table() is the entry point used by the other scripts: it serves the
+store while the CSV's size and mtime match the ones recorded in it, and
+otherwise parses the CSV once and writes the store for next time. Stores
+live in the cache directory, never next to the input files.
+
+Usage:
+    python scripts/series_store.py                 # convert data/*.csv
+    python scripts/series_store.py path/to/file.csv
+
+Requirements:
+    pip install pandas numpy
+"""
+
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from report_cache import DEFAULT_CACHE_DIR
+
+STORE_SUFFIX = '.cqs'
+STORE_DIR = os.path.join(DEFAULT_CACHE_DIR, 'series')
+FORMAT_VERSION = 2
+
+# NumPy dtype kinds stored as-is: bool, signed/unsigned int, float
+NUMERIC_KINDS = 'biuf'
+
+def store_path_for(csv_path, store_dir=STORE_DIR):
+    """
+    data/foo.csv -> .report_cache/series/foo-<hash of the absolute path>.cqs
+
+    The hash keeps same-named files from different directories apart.
+    """
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    digest = hashlib.blake2b(os.path.abspath(csv_path).encode(), digest_size=6).hexdigest()
+    return os.path.join(store_dir, f"{name}-{digest}{STORE_SUFFIX}")
+
+def read_csv(csv_path):
+    """Parse a performance CSV the way every loader does ('date' parsed)"""
+    df = pd.read_csv(csv_path)
+    df['date'] = pd.to_datetime(df['date'])
+    return df
+
+def _source_stat(csv_path):
+    """Size and mtime (ns) of a source file, as recorded in meta.json"""
+    stat = os.stat(csv_path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+def convert_csv(csv_path, store_path=None):
+    """
+    Convert a performance CSV (backtest or live schema) into a store
+
+    Raises ValueError for files that cannot be stored (see write_store).
+
+    Returns:
+        str: Path of the written store
+    """
+    if store_path is None:
+        store_path = store_path_for(csv_path)
+
+    source_stat = _source_stat(csv_path)
+    df = read_csv(csv_path)
+    return write_store(df, store_path, source=os.path.abspath(csv_path),
+                       source_stat=source_stat)
+
+def write_store(df, store_path, source=None, source_stat=None):
+    """
+    Write a DataFrame with a parsed 'date' column into a store (atomically)
+
+    Every column is stored with its own dtype, so load_frame() returns
+    an identical frame.
+
+    Args:
+        df: Frame as returned by read_csv()
+        store_path: Store directory
+        source: Source file recorded in meta.json
+        source_stat: _source_stat() of the source, taken before parsing
+
+    Raises:
+        ValueError: If 'date' is not a naive datetime64 column or another
+                    column is not numeric (e.g. a notes or symbol column)
+
+    Returns:
+        str: Path of the written store
+    """
+    columns = list(df.columns)
+    arrays = [df[column].to_numpy() for column in columns]
+    for column, values in zip(columns, arrays):
+        kind = 'M' if column == 'date' else NUMERIC_KINDS
+        if values.dtype.kind not in kind:
+            raise ValueError(f"Column {column!r} has dtype {df[column].dtype}, "
+                             f"which the series store does not hold")
+
+    tmp_path = f"{store_path}.tmp-{os.getpid()}"
+    os.makedirs(tmp_path)
+    try:
+        for i, values in enumerate(arrays):
+            np.save(os.path.join(tmp_path, f'col{i}.npy'), values)
+
+        meta = {
+            'version': FORMAT_VERSION,
+            'rows': len(df),
+            'columns': columns,
+            'source': source,
+            'source_stat': source_stat
+        }
+        with open(os.path.join(tmp_path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+        if os.path.isdir(store_path):
+            shutil.rmtree(store_path)
+        os.rename(tmp_path, store_path)
+    finally:
+        if os.path.isdir(tmp_path):
+            shutil.rmtree(tmp_path)
+
+    return store_path
+
+def read_meta(store_path):
+    """meta.json of a store (ValueError for another format version)"""
+    with open(os.path.join(store_path, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported store version {meta['version']} in {store_path}")
+    return meta
+
+def load_series(store_path, mmap=True):
+    """
+    Load a store as NumPy arrays
+
+    Args:
+        store_path: Store directory
+        mmap: Memory-map the columns (zero-copy, read-only views)
+
+    Returns:
+        dict: Column name -> array ('date' is datetime64)
+    """
+    meta = read_meta(store_path)
+    mode = 'r' if mmap else None
+    return {column: np.load(os.path.join(store_path, f'col{i}.npy'), mmap_mode=mode)
+            for i, column in enumerate(meta['columns'])}
+
+def load_frame(store_path):
+    """
+    Load a store as a DataFrame, identical to read_csv() of its source
+
+    Returns:
+        pd.DataFrame: Columns in CSV order, 'date' as datetime64
+    """
+    return pd.DataFrame(load_series(store_path))
+
+def is_fresh(store_path, csv_path):
+    """Whether the store exists and was converted from the CSV as it is now"""
+    try:
+        return read_meta(store_path)['source_stat'] == _source_stat(csv_path)
+    except (OSError, ValueError, KeyError):
+        return False
+
+def load_table(csv_path, store_dir=STORE_DIR):
+    """
+    Load a performance CSV through its columnar store
+
+    Files the store cannot hold (text columns, tz-aware dates) are
+    parsed from the CSV every time. Raises FileNotFoundError if neither
+    the CSV nor a store exists.
+
+    Returns:
+        pd.DataFrame: Same columns as the CSV, 'date' parsed
+    """
+    store_path = store_path_for(csv_path, store_dir)
+
+    if not os.path.exists(csv_path):
+        if os.path.exists(os.path.join(store_path, 'meta.json')):
+            return load_frame(store_path)
+        raise FileNotFoundError(csv_path)
+
+    if is_fresh(store_path, csv_path):
+        return load_frame(store_path)
+
+    source_stat = _source_stat(csv_path)
+    df = read_csv(csv_path)
+    try:
+        os.makedirs(store_dir, exist_ok=True)
+        write_store(df, store_path, source=os.path.abspath(csv_path), source_stat=source_stat)
+    except (OSError, ValueError):
+        pass  # Read-only checkout or unstorable columns: parse the CSV every time
+    return df
+
+def main():
+    """Convert CSV files and compare load times"""
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - COLUMNAR SERIES STORE")
+    print("=" * 70 + "\n")
+
+    files = sys.argv[1:] or sorted(glob.glob('data/*.csv'))
+    if not files:
+        print("ERROR: No CSV files found in data/")
+        print("Please run this script from the repository root directory.")
+        return
+
+    print(f"{'File':<40} {'Rows':>6} {'CSV parse':>11} {'Store load':>11}")
+    print("-" * 70)
+
+    os.makedirs(STORE_DIR, exist_ok=True)
+    for csv_path in files:
+        try:
+            store_path = convert_csv(csv_path)
+        except ValueError as e:
+            print(f"{os.path.basename(csv_path):<40} skipped: {e}")
+            continue
+
+        start = time.perf_counter()
+        df = read_csv(csv_path)
+        csv_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        load_series(store_path)
+        store_time = time.perf_counter() - start
+
+        print(f"{os.path.basename(csv_path):<40} {len(df):>6} "
+              f"{csv_time * 1000:>9.2f}ms {store_time * 1000:>9.2f}ms")
+
+    print("\n" + "=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
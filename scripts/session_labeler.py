@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Bulk Session Labeler
+====================
+
+Tags tick and bar timestamps with the session that was active, using the
+SessionManager.SESSIONS definitions via a precomputed SessionCalendar.
+
+Timestamps are int64 epoch nanoseconds (or datetime64[ns]). Arrays are
+processed in fixed-size chunks into a preallocated int8 output, so the
+input and output can be np.memmap files far larger than RAM and working
+memory stays bounded by the chunk size.
+
+Session codes index SessionManager.SESSIONS order
+(0=nikkei, 1=dax, 2=nasdaq); -1 means no session (overnight gap).
+
+Usage:
+    python scripts/session_labeler.py
+
+Requirements:
+    pip install pytz numpy pandas
+"""
+
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from session_sequencing_reference import SessionCalendar, SessionManager
+
+DEFAULT_CHUNK_SIZE = 4_000_000
+
+NS_PER_DAY = 86400 * 10**9
+
+def calendar_for_range(min_ns: int, max_ns: int, sessions=None) -> SessionCalendar:
+    """
+    Build a calendar covering every instant between min_ns and max_ns
+
+    Two days of padding on each side catch sessions whose local
+    date differs from the UTC date.
+    """
+    if sessions is None:
+        sessions = SessionManager.SESSIONS
+    first = (datetime.fromtimestamp(min_ns // 10**9, pytz.UTC) - timedelta(days=2)).date()
+    last = (datetime.fromtimestamp(max_ns // 10**9, pytz.UTC) + timedelta(days=2)).date()
+    return SessionCalendar(sessions, first, last)
+
+def label_sessions(epoch_ns, calendar: SessionCalendar = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE, out=None) -> np.ndarray:
+    """
+    Label an array of timestamps by session, chunk by chunk
+
+    Args:
+        epoch_ns: int64 epoch nanoseconds (array or np.memmap)
+        calendar: SessionCalendar covering the data (built if None)
+        chunk_size: Rows processed per chunk
+        out: Optional preallocated int8 array (e.g. np.memmap)
+
+    Returns:
+        np.ndarray: int8 session codes, NO_SESSION where none is active
+    """
+    epoch_ns = np.asarray(epoch_ns)
+    if np.issubdtype(epoch_ns.dtype, np.datetime64):
+        epoch_ns = epoch_ns.astype('datetime64[ns]').view(np.int64)
+
+    if out is None:
+        out = np.empty(len(epoch_ns), dtype=np.int8)
+    if len(epoch_ns) == 0:
+        return out
+
+    if calendar is None:
+        min_ns, max_ns = _chunked_min_max(epoch_ns, chunk_size)
+        calendar = calendar_for_range(min_ns, max_ns)
+
+    for start in range(0, len(epoch_ns), chunk_size):
+        stop = start + chunk_size
+        out[start:stop] = calendar.label(epoch_ns[start:stop])
+
+    return out
+
+def iter_labeled_chunks(chunks, calendar: SessionCalendar, column: str = 'timestamp'):
+    """
+    Label a stream of chunks, e.g. from pd.read_csv(chunksize=...)
+
+    Args:
+        chunks: Iterable of DataFrames (the timestamp column is labeled,
+                with the same handling as label_frame) or of timestamp
+                arrays
+        calendar: SessionCalendar covering the data
+        column: Timestamp column of DataFrame chunks
+
+    Yields:
+        tuple: (chunk, int8 session codes)
+    """
+    for chunk in chunks:
+        values = _timestamp_values(chunk[column]) if isinstance(chunk, pd.DataFrame) else chunk
+        yield chunk, label_sessions(values, calendar, chunk_size=max(len(chunk), 1))
+
+def label_frame(df: pd.DataFrame, column: str = 'timestamp',
+                calendar: SessionCalendar = None) -> pd.Series:
+    """
+    Session labels for a DataFrame timestamp column as a Categorical
+
+    Returns:
+        pd.Series: Categorical of session names (NaN outside sessions)
+    """
+    codes = label_sessions(_timestamp_values(df[column]), calendar)
+    names = calendar.session_names if calendar is not None else tuple(SessionManager.SESSIONS)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=list(names)),
+                     index=df.index, name='session')
+
+def _timestamp_values(values: pd.Series) -> np.ndarray:
+    """
+    Timestamp column -> array for label_sessions
+
+    Text (e.g. an unparsed CSV column) is parsed, aware timestamps are
+    converted to UTC, and naive timestamps are taken as UTC.
+    """
+    if not (pd.api.types.is_datetime64_any_dtype(values.dtype)
+            or pd.api.types.is_integer_dtype(values.dtype)):
+        values = pd.to_datetime(values, utc=True)
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+    return values.to_numpy()
+
+def _chunked_min_max(epoch_ns, chunk_size):
+    """Min and max without materializing more than one chunk"""
+    lo, hi = None, None
+    for start in range(0, len(epoch_ns), chunk_size):
+        chunk = epoch_ns[start:start + chunk_size]
+        chunk_lo, chunk_hi = int(chunk.min()), int(chunk.max())
+        lo = chunk_lo if lo is None else min(lo, chunk_lo)
+        hi = chunk_hi if hi is None else max(hi, chunk_hi)
+    return lo, hi
+
+def synthetic_ticks(num_rows: int, start: datetime, days: int, seed: int = 0) -> np.ndarray:
+    """Sorted random epoch-nanosecond tick timestamps over a number of days"""
+    rng = np.random.default_rng(seed)
+    start_ns = int(start.timestamp()) * 10**9
+    offsets = rng.integers(0, days * NS_PER_DAY, size=num_rows, dtype=np.int64)
+    offsets.sort()
+    return start_ns + offsets
+
+def benchmark_labeler(num_rows: int = 20_000_000, days: int = 3 * 365,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Measure labeling throughput on synthetic ticks
+
+    Returns:
+        dict: Row count, elapsed seconds, rows/sec and per-session counts
+    """
+    start = datetime(2023, 1, 2, tzinfo=pytz.UTC)
+    ticks = synthetic_ticks(num_rows, start, days)
+    calendar = calendar_for_range(int(ticks[0]), int(ticks[-1]))
+
+    t0 = time.perf_counter()
+    codes = label_sessions(ticks, calendar, chunk_size)
+    elapsed = time.perf_counter() - t0
+
+    counts = np.bincount(codes.astype(np.int16) + 1, minlength=len(calendar.session_names) + 1)
+    return {
+        'num_rows': num_rows,
+        'elapsed': elapsed,
+        'rows_per_sec': num_rows / elapsed,
+        'counts': dict(zip(('none',) + calendar.session_names, counts.tolist()))
+    }
+
+def main():
+    """Run the labeling throughput benchmark"""
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - BULK SESSION LABELER BENCHMARK")
+    print("=" * 70 + "\n")
+
+    results = benchmark_labeler()
+
+    print(f"Rows labeled:  {results['num_rows']:,}")
+    print(f"Elapsed:       {results['elapsed']:.2f}s")
+    print(f"Throughput:    {results['rows_per_sec']:,.0f} rows/sec\n")
+
+    print("ROWS BY SESSION:")
+    for name, count in results['counts'].items():
+        print(f"  {name:<8} {count:>12,}")
+
+    print("\n" + "=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
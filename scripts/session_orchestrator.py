@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Live Session Orchestrator
+=========================
+
+asyncio runtime loop around the reference framework objects:
+
+- Session open/close events are scheduled from SessionManager.SESSIONS
+  (via its SessionCalendar, so every instant is DST-correct UTC)
+- VIX is refreshed on an interval in a worker thread, so a slow or
+  failing data source never blocks the event loop; while the monitor
+  runs on fallback levels (no market data) sessions are sized with the
+  crisis multiplier
+- SessionManager.enforce_flat_overnight runs every flat_check_interval
+  seconds (sub-second by default) against the broker's live positions,
+  and any overnight position is flattened immediately
+- Orders go through a pluggable Broker; SimulatedBroker fills in-process
+  on a random-walk price
+
+Each stage records its latency in a LatencyHistogram (log-spaced
+buckets, constant memory), reported as p50/p99/max.
+
+A ScaledClock lets the same loop run at wall-clock speed or many times
+faster for a demo or a soak test.
+
+NOTE: Trade directions come from a caller-supplied function - signal
+generation is proprietary and not included. The demo uses random
+directions.
+
+Usage:
+    python scripts/session_orchestrator.py                  # 2 simulated days
+    python scripts/session_orchestrator.py --speed 1 --duration 60
+    python scripts/session_orchestrator.py --csv data/vix_history.csv
+
+Requirements:
+    pip install pytz numpy pandas
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+
+import pytz
+
+from risk_core import MONITOR_TABLE, REGIME_NAMES
+from session_sequencing_reference import SessionManager, to_epoch_ns
+from vix_data import CSVVIXSource
+from vix_monitor import VIXMonitor
+
+# Event kinds, in processing order for events at the same instant
+SESSION_CLOSE, SESSION_OPEN = range(2)
+
+DEFAULT_VIX_REFRESH_SECONDS = 15 * 60
+DEFAULT_FLAT_CHECK_INTERVAL = 0.25
+
+# Timer lag is kept per loop: the session loop wakes on the scaled clock,
+# the flat loop on real time
+STAGES = ('session_open', 'session_close', 'vix_refresh', 'flat_check', 'flatten',
+          'session_timer_lag', 'flat_timer_lag')
+
+# Sizing while the VIX monitor has no market data (fallback levels)
+FALLBACK_REGIME = len(REGIME_NAMES) - 1
+FALLBACK_MULTIPLIER = MONITOR_TABLE.multipliers[FALLBACK_REGIME]
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram
+
+    Buckets are log-spaced from 1 microsecond to 100 seconds (20 per
+    decade, ~12% wide), so recording is a bisect and memory is constant.
+    Percentiles report the upper edge of the bucket they fall in (capped
+    at the observed maximum).
+    """
+
+    MIN_SECONDS = 1e-6
+    BUCKETS_PER_DECADE = 20
+    DECADES = 8
+
+    def __init__(self):
+        num_edges = self.BUCKETS_PER_DECADE * self.DECADES + 1
+        self.edges = [self.MIN_SECONDS * 10 ** (i / self.BUCKETS_PER_DECADE)
+                      for i in range(num_edges)]
+        self.counts = [0] * (num_edges + 1)   # + underflow and overflow buckets
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Add one observation"""
+        self.counts[bisect_right(self.edges, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """Upper bucket edge below which q% of observations fall"""
+        if self.count == 0:
+            return math.nan
+        target = math.ceil(self.count * q / 100)
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self.edges[i], self.max) if i < len(self.edges) else self.max
+        return self.max
+
+    def summary(self) -> dict:
+        """Count, mean, p50, p99 and max in seconds"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else math.nan,
+            'p50': self.percentile(50),
+            'p99': self.percentile(99),
+            'max': self.max
+        }
+
+class ScaledClock:
+    """
+    UTC clock that can run faster than wall time
+
+    now() starts at `start` and advances `speed` simulated seconds per
+    real second; speed=1 with start=None is the real clock.
+    """
+
+    def __init__(self, start: datetime = None, speed: float = 1.0):
+        self.start = start if start is not None else datetime.now(pytz.UTC)
+        self.speed = speed
+        self._origin = time.perf_counter()
+
+    def now(self) -> datetime:
+        """Current (simulated) UTC time"""
+        elapsed = (time.perf_counter() - self._origin) * self.speed
+        return self.start + timedelta(seconds=elapsed)
+
+    def now_ns(self) -> int:
+        """Current (simulated) time in epoch nanoseconds"""
+        return to_epoch_ns(self.now())
+
+    async def sleep_until(self, epoch_ns: int) -> None:
+        """Sleep until a simulated instant"""
+        delay = (epoch_ns - self.now_ns()) / 1e9 / self.speed
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+class Broker:
+    """
+    Base class for broker connections
+
+    Sizes are signed position sizes in % of portfolio (positive = long).
+    """
+
+    async def positions(self) -> dict:
+        """
+        Open positions
+
+        Returns:
+            dict: Instrument -> signed size, non-zero positions only
+        """
+        raise NotImplementedError
+
+    async def submit_order(self, instrument: str, size: float) -> float:
+        """
+        Trade `size` of an instrument at market
+
+        Returns:
+            float: Fill price
+        """
+        raise NotImplementedError
+
+    async def flatten(self, instrument: str = None) -> dict:
+        """
+        Close one instrument (or every position if None) at market
+
+        Returns:
+            dict: Instrument -> realized P&L (% of portfolio)
+        """
+        raise NotImplementedError
+
+class SimulatedBroker(Broker):
+    """
+    In-process broker that fills immediately on a random-walk price
+
+    Prices move with `hourly_vol` per square-root hour of (simulated) clock
+    time between queries. An optional `latency` (seconds) is awaited on
+    every call to mimic a network round trip.
+    """
+
+    def __init__(self, clock: ScaledClock, hourly_vol: float = 0.004,
+                 latency: float = 0.0, seed: int = 0):
+        self.clock = clock
+        self.hourly_vol = hourly_vol
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._positions = {}     # instrument -> (size, entry price)
+        self._prices = {}        # instrument -> (price, epoch ns)
+
+    def _mark(self, instrument: str) -> float:
+        now_ns = self.clock.now_ns()
+        price, last_ns = self._prices.get(instrument, (100.0, now_ns))
+        hours = max(now_ns - last_ns, 0) / 3.6e12
+        price *= math.exp(self._rng.gauss(0.0, self.hourly_vol * math.sqrt(hours)))
+        self._prices[instrument] = (price, now_ns)
+        return price
+
+    async def _round_trip(self) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    async def positions(self) -> dict:
+        await self._round_trip()
+        return {instrument: size for instrument, (size, _) in self._positions.items()}
+
+    async def submit_order(self, instrument: str, size: float) -> float:
+        await self._round_trip()
+        price = self._mark(instrument)
+        held, entry = self._positions.get(instrument, (0.0, price))
+        total = held + size
+        if total == 0:
+            self._positions.pop(instrument, None)
+        else:
+            # Average entry for adds; reductions keep the original entry;
+            # a reversal starts a new position at the fill price
+            if held == 0 or (held > 0) == (size > 0):
+                entry = (held * entry + size * price) / total
+            elif (total > 0) != (held > 0):
+                entry = price
+            self._positions[instrument] = (total, entry)
+        return price
+
+    async def flatten(self, instrument: str = None) -> dict:
+        await self._round_trip()
+        targets = [instrument] if instrument is not None else list(self._positions)
+        realized = {}
+        for name in targets:
+            if name not in self._positions:
+                continue
+            size, entry = self._positions.pop(name)
+            realized[name] = size * (self._mark(name) / entry - 1)
+        return realized
+
+class SessionOrchestrator:
+    """
+    asyncio loop driving sessions, VIX refreshes and flat checks
+
+    Three tasks share one SessionManager:
+    - session loop: sleeps until the next open/close, sizes and places the
+      session's position at the open (staying flat until the first VIX
+      refresh), flattens it and records the result with its direction,
+      size, date and regime (which drives conditional expansion and any
+      ledger on the manager) at the close
+    - VIX loop: refreshes the monitor in a worker thread every
+      vix_refresh_seconds (real time) and updates the multiplier
+    - flat loop: every flat_check_interval seconds, asks the broker for
+      positions and flattens everything if no session is active
+    """
+
+    def __init__(self, broker: Broker = None, manager: SessionManager = None,
+                 vix_monitor: VIXMonitor = None, vix_source=None,
+                 clock: ScaledClock = None, direction_fn=None,
+                 vix_refresh_seconds: float = DEFAULT_VIX_REFRESH_SECONDS,
+                 flat_check_interval: float = DEFAULT_FLAT_CHECK_INTERVAL,
+                 verbose: bool = True):
+        """
+        Args:
+            broker: Broker connection (SimulatedBroker if None)
+            manager: SessionManager (quiet instance if None)
+            vix_monitor: VIXMonitor; created on the first refresh if None
+            vix_source: VIX data source for a created monitor
+            clock: ScaledClock (real time if None)
+            direction_fn: direction_fn(market) -> 'long', 'short' or None
+                          (no trade); None never trades
+            vix_refresh_seconds: Real seconds between VIX refreshes
+            flat_check_interval: Real seconds between flat checks
+            verbose: Print session events
+        """
+        self.clock = clock if clock is not None else ScaledClock()
+        self.broker = broker if broker is not None else SimulatedBroker(self.clock)
+        self.manager = manager if manager is not None else SessionManager(verbose=False)
+        self.vix_monitor = vix_monitor
+        self.vix_source = vix_source
+        self.direction_fn = direction_fn
+        self.vix_refresh_seconds = vix_refresh_seconds
+        self.flat_check_interval = flat_check_interval
+        self.verbose = verbose
+
+        self.vix_multiplier = 1.0
+        self.vix_regime = None    # Regime code of the latest refresh
+        self.vix_is_fallback = False
+        self.histograms = {stage: LatencyHistogram() for stage in STAGES}
+        self.flat_violations = 0
+        self.session_log = []     # (market, local session date, pnl)
+
+        self._session_pnl = {}    # instrument -> realized P&L since its open
+        self._trades = {}         # instrument -> (direction, size, regime) taken at the open
+        self._nikkei_green = {}   # local session date -> Nikkei result, for expansion
+        self._next_event_ns = None
+
+    def _log(self, message: str) -> None:
+        if self.verbose:
+            print(f"[{self.clock.now():%Y-%m-%d %H:%M:%S} UTC] {message}")
+
+    def _schedule(self, now_ns: int):
+        """
+        Open/close events from now until the end of the calendar
+
+        A session already in progress gets an immediate open event.
+
+        Returns:
+            tuple: (calendar, sorted [(instant, kind, segment)])
+        """
+        calendar = self.manager.get_calendar(self.clock.now())
+        events = []
+        for segment, (start, end) in enumerate(zip(calendar.starts, calendar.ends)):
+            if end <= now_ns:
+                continue
+            events.append((max(start, now_ns), SESSION_OPEN, segment))
+            events.append((end, SESSION_CLOSE, segment))
+        events.sort()
+        return calendar, events
+
+    async def _session_loop(self) -> None:
+        while True:
+            calendar, events = self._schedule(self.clock.now_ns())
+            if not events:
+                # Past the calendar horizon: rebuilt on the next lookup
+                await asyncio.sleep(self.flat_check_interval)
+                continue
+
+            for instant, kind, segment in events:
+                self._next_event_ns = instant
+                await self.clock.sleep_until(instant)
+                self.histograms['session_timer_lag'].record(
+                    max(self.clock.now_ns() - instant, 0) / 1e9 / self.clock.speed)
+
+                market = calendar.session_names[calendar.codes[segment]]
+                day = calendar.dates[segment]
+                start = time.perf_counter()
+                if kind == SESSION_OPEN:
+                    await self._open_session(market, day)
+                    self.histograms['session_open'].record(time.perf_counter() - start)
+                else:
+                    await self._close_session(market, day)
+                    self.histograms['session_close'].record(time.perf_counter() - start)
+
+    async def _open_session(self, market: str, day: int) -> None:
+        instrument = SessionManager.SESSIONS[market]['instrument']
+        self._session_pnl[instrument] = 0.0
+        self._restore_nikkei(market, day)
+
+        direction = self.direction_fn(market) if self.direction_fn else None
+        if direction is None:
+            self._log(f"{market.upper()} open - no signal, staying flat")
+            return
+        if self.vix_regime is None:
+            self._log(f"{market.upper()} open - no VIX regime yet, staying flat")
+            return
+
+        size = self.manager.calculate_position_size(market, direction, self.vix_multiplier,
+                                                    date.fromordinal(day), record=True)
+        self._trades[instrument] = (direction, size, self.vix_regime)
+        signed = size if direction == 'long' else -size
+        price = await self.broker.submit_order(instrument, signed)
+        fallback = ", fallback - no VIX data" if self.vix_is_fallback else ""
+        self._log(f"{market.upper()} open - {direction} {size:.2f}% {instrument} @ {price:.2f} "
+                  f"(VIX {self.vix_multiplier:.2f}x{fallback})")
+
+    async def _close_session(self, market: str, day: int) -> None:
+        instrument = SessionManager.SESSIONS[market]['instrument']
+        self._add_realized(await self.broker.flatten(instrument))
+        pnl = self._session_pnl.pop(instrument, 0.0)
+        direction, size, regime = self._trades.pop(instrument, (None, 0.0, None))
+
+        self._restore_nikkei(market, day)
+        self.manager.record_session_result(market, pnl, direction, size,
+                                           date.fromordinal(day), regime)
+        self.session_log.append((market, day, pnl))
+        expansion = ''
+        if market == 'nikkei':
+            self._nikkei_green[day] = self.manager.nikkei_was_green
+            expansion = " - expansion ON" if self.manager.nikkei_was_green else " - expansion OFF"
+        self._log(f"{market.upper()} close - P&L {pnl:+.3f}%{expansion}")
+
+    def _restore_nikkei(self, market: str, day: int) -> None:
+        """
+        Expansion from the same date's Nikkei result
+
+        The Nasdaq session of a date opens after the next date's Nikkei
+        session has closed, so the manager's latest result can belong to
+        the wrong cycle.
+        """
+        if market != 'nikkei':
+            self.manager.nikkei_was_green = self._nikkei_green.get(day, False)
+
+    def _add_realized(self, realized: dict) -> None:
+        for instrument, pnl in realized.items():
+            self._session_pnl[instrument] = self._session_pnl.get(instrument, 0.0) + pnl
+
+    async def _vix_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = time.perf_counter()
+            self.vix_multiplier, self.vix_regime, self.vix_is_fallback = (
+                await loop.run_in_executor(None, self._refresh_vix))
+            self.histograms['vix_refresh'].record(time.perf_counter() - start)
+            await asyncio.sleep(self.vix_refresh_seconds)
+
+    def _refresh_vix(self) -> tuple:
+        """
+        Blocking VIX refresh (runs in a worker thread)
+
+        Fallback levels are not market data, so they size as a crisis
+        regime instead of the regime the fallback VIX would classify as.
+
+        Returns:
+            tuple: (sizing multiplier, regime code, is_fallback)
+        """
+        if self.vix_monitor is None:
+            self.vix_monitor = VIXMonitor(self.vix_source)
+        else:
+            self.vix_monitor.refresh()
+        if self.vix_monitor.is_fallback:
+            return FALLBACK_MULTIPLIER, FALLBACK_REGIME, True
+        return (self.vix_monitor.get_multiplier(),
+                REGIME_NAMES.index(self.vix_monitor.get_regime()), False)
+
+    async def _flat_loop(self) -> None:
+        interval = self.flat_check_interval
+        next_wake = time.perf_counter()
+        while True:
+            next_wake += interval
+            await asyncio.sleep(max(next_wake - time.perf_counter(), 0))
+            woke = time.perf_counter()
+            self.histograms['flat_timer_lag'].record(max(woke - next_wake, 0))
+            if woke - next_wake > interval:
+                next_wake = woke   # Fell behind - don't fire a burst of checks
+
+            # A close that is due but not yet handled is the session loop's job
+            if self._next_event_ns is not None and self.clock.now_ns() >= self._next_event_ns:
+                continue
+
+            positions = await self.broker.positions()
+            if self.manager.enforce_flat_overnight(bool(positions), self.clock.now()):
+                self.flat_violations += 1
+                flatten_start = time.perf_counter()
+                self._add_realized(await self.broker.flatten())
+                self.histograms['flatten'].record(time.perf_counter() - flatten_start)
+                self._log(f"FLAT CHECK - overnight position {positions} flattened")
+            self.histograms['flat_check'].record(time.perf_counter() - woke)
+
+    async def run(self, duration: float = None) -> None:
+        """
+        Run until cancelled, or for `duration` real seconds
+
+        Open positions are flattened on the way out.
+        """
+        tasks = [asyncio.create_task(coro) for coro in
+                 (self._vix_loop(), self._session_loop(), self._flat_loop())]
+        try:
+            if duration is None:
+                await asyncio.gather(*tasks)
+            else:
+                await asyncio.sleep(duration)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._add_realized(await self.broker.flatten())
+
+    def latency_report(self) -> dict:
+        """Stage -> LatencyHistogram.summary()"""
+        return {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+
+def main():
+    """Run the orchestrator on a fast simulated clock"""
+
+    parser = argparse.ArgumentParser(description="Live session orchestrator (simulated broker)")
+    parser.add_argument('--speed', type=float, default=20_000,
+                        help="Simulated seconds per real second (1 = real time)")
+    parser.add_argument('--duration', type=float, default=9.0,
+                        help="Real seconds to run")
+    parser.add_argument('--csv', help="Local CSV of daily VIX closes (date, VIX, VIX3M) - no network")
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - LIVE SESSION ORCHESTRATOR (SIMULATED BROKER)")
+    print("=" * 70 + "\n")
+
+    # Start a little before the next Nikkei open (local midnight in Tokyo)
+    tokyo = SessionManager.SESSIONS['nikkei']['tz']
+    today = datetime.now(tokyo).date()
+    start = tokyo.localize(datetime.combine(today + timedelta(days=1), datetime.min.time()))
+    start = start.astimezone(pytz.UTC) - timedelta(minutes=30)
+
+    clock = ScaledClock(start, speed=args.speed)
+    broker = SimulatedBroker(clock, latency=0.0005, seed=args.seed)
+    rng = random.Random(args.seed)
+    orchestrator = SessionOrchestrator(
+        broker, clock=clock,
+        vix_source=CSVVIXSource(args.csv) if args.csv else None,
+        direction_fn=lambda market: 'long' if rng.random() < 0.6 else 'short',
+        vix_refresh_seconds=3.0)
+
+    async def stray_order():
+        # Leave a position open after the first Nasdaq close to exercise the flat check
+        while not any(market == 'nasdaq' for market, _, _ in orchestrator.session_log):
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.1)
+        await broker.submit_order('NQ', 1.0)
+
+    async def demo():
+        stray = asyncio.create_task(stray_order())
+        await orchestrator.run(args.duration)
+        stray.cancel()
+
+    asyncio.run(demo())
+
+    print(f"\nSessions closed:   {len(orchestrator.session_log)}")
+    print(f"Flat violations:   {orchestrator.flat_violations}")
+
+    print(f"\n{'Stage':<18} {'Count':>8} {'p50':>11} {'p99':>11} {'Max':>11}")
+    print("-" * 70)
+    for stage, stats in orchestrator.latency_report().items():
+        if stats['count'] == 0:
+            continue
+        print(f"{stage:<18} {stats['count']:>8} " + " ".join(
+            f"{stats[key] * 1000:>9.3f}ms" for key in ('p50', 'p99', 'max')))
+
+    print("\n" + "=" * 70)
+    print("NOTE: Random directions and simulated fills - illustrates mechanics only.")
+    print("=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -22,17 +22,180 @@ What you CAN'T see:
 ✗ Exact expansion parameters (proprietary)
 
 Requirements:
-    pip install pytz
+    pip install pytz numpy
 
 Usage:
     # This is a reference implementation - not for live trading
     python session_sequencing_sanitized.py
 """
 
-from datetime import datetime, time
+import argparse
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
 from typing import Literal
+import numpy as np
 import pytz
 
+from risk_core import MONITOR_TABLE
+
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=pytz.UTC)
+
+# Code used by SessionCalendar.label() when no session is active
+NO_SESSION = -1
+
+def to_epoch_ns(timestamp: datetime) -> int:
+    """
+    Convert a timezone-aware datetime to integer epoch nanoseconds
+    
+    Uses integer arithmetic so no precision is lost to float seconds.
+    """
+    delta = timestamp - EPOCH_UTC
+    return ((delta.days * 86400 + delta.seconds) * 10**6 + delta.microseconds) * 1000
+
+class SessionCalendar:
+    """
+    Precomputed UTC index of session open/close instants
+    
+    Session open/close times are local wall-clock times in each session's
+    timezone. The calendar localizes them for every date in the range
+    (so DST shifts land on the correct UTC instants), handles sessions
+    whose close falls on the next day or across UTC midnight, and stores
+    the result as sorted, non-overlapping UTC intervals in epoch
+    nanoseconds.
+    
+    Where sessions overlap in UTC, the session listed first in the
+    configuration wins, matching SessionManager.get_active_session.
+    
+    Lookups are a bisect (scalar) or searchsorted (arrays).
+    """
+    
+    def __init__(self, sessions: dict, start_date: date, end_date: date, weekdays=None):
+        """
+        Build the interval index
+        
+        Args:
+            sessions: Session configs (SessionManager.SESSIONS layout)
+            start_date: First local session date to include
+            end_date: Last local session date to include
+            weekdays: Local weekdays that trade (0=Mon); None for every day
+        """
+        self.session_names = tuple(sessions)
+        self.start_date = start_date
+        self.end_date = end_date
+        
+        intervals = []
+        num_days = (end_date - start_date).days + 1
+        for code, name in enumerate(self.session_names):
+            config = sessions[name]
+            tz = config['tz']
+            for offset in range(num_days):
+                day = start_date + timedelta(days=offset)
+                if weekdays is not None and day.weekday() not in weekdays:
+                    continue
+                close_day = day if config['close'] > config['open'] else day + timedelta(days=1)
+                open_utc = tz.localize(datetime.combine(day, config['open']))
+                close_utc = tz.localize(datetime.combine(close_day, config['close']))
+                intervals.append((to_epoch_ns(open_utc), to_epoch_ns(close_utc), code,
+                                  day.toordinal()))
+        
+        self.starts, self.ends, self.codes, self.dates = self._resolve_overlaps(intervals)
+        
+        self._starts_array = np.array(self.starts, dtype=np.int64)
+        self._ends_array = np.array(self.ends, dtype=np.int64)
+        self._codes_array = np.array(self.codes, dtype=np.int8)
+        
+        first = min((iv[0] for iv in intervals), default=0)
+        last = max((iv[1] for iv in intervals), default=0)
+        self.coverage = (first, last)
+    
+    @staticmethod
+    def _resolve_overlaps(intervals):
+        """
+        Sweep interval edges into non-overlapping labeled segments
+        
+        Returns:
+            tuple: (starts, ends, codes, dates) lists sorted by start, where
+                   dates holds the local session date ordinal of each segment
+        """
+        edges = {}
+        for start, end, code, day in intervals:
+            if end <= start:
+                continue
+            edges.setdefault(start, []).append((code, day, 1))
+            edges.setdefault(end, []).append((code, day, -1))
+        
+        active = [0] * (max((iv[2] for iv in intervals), default=-1) + 1)
+        active_date = [0] * len(active)
+        starts, ends, codes, dates = [], [], [], []
+        current = (NO_SESSION, 0)
+        
+        for instant in sorted(edges):
+            for code, day, delta in sorted(edges[instant], key=lambda edge: edge[2]):
+                active[code] += delta
+                if delta > 0:
+                    active_date[code] = day
+            label = next((code for code, count in enumerate(active) if count > 0), NO_SESSION)
+            segment = (label, active_date[label] if label != NO_SESSION else 0)
+            if segment == current:
+                continue
+            if current[0] != NO_SESSION:
+                ends.append(instant)
+            if label != NO_SESSION:
+                starts.append(instant)
+                codes.append(label)
+                dates.append(segment[1])
+            current = segment
+        
+        return starts, ends, codes, dates
+    
+    def covers(self, timestamp: datetime) -> bool:
+        """
+        Whether the index range contains the timestamp
+        
+        The last close instant is included, so a flat check at the final
+        close is answered by this index rather than a rebuilt one.
+        """
+        return self.coverage[0] <= to_epoch_ns(timestamp) <= self.coverage[1]
+    
+    def session_at(self, timestamp: datetime) -> str:
+        """
+        Session active at a timezone-aware timestamp
+        
+        Returns:
+            str: Session name, or None during the overnight gap
+        """
+        code = self.code_at_ns(to_epoch_ns(timestamp))
+        return None if code == NO_SESSION else self.session_names[code]
+    
+    def code_at_ns(self, epoch_ns: int) -> int:
+        """Session code active at an epoch-nanosecond instant (NO_SESSION if none)"""
+        idx = bisect_right(self.starts, epoch_ns) - 1
+        if idx >= 0 and epoch_ns < self.ends[idx]:
+            return self.codes[idx]
+        return NO_SESSION
+    
+    def label(self, epoch_ns) -> np.ndarray:
+        """
+        Vectorized session labels for an array of instants
+        
+        Args:
+            epoch_ns: int64 epoch nanoseconds, or datetime64 values
+            
+        Returns:
+            np.ndarray: int8 session codes (index into session_names),
+                        NO_SESSION where no session is active
+        """
+        values = np.asarray(epoch_ns)
+        if np.issubdtype(values.dtype, np.datetime64):
+            values = values.astype('datetime64[ns]').view(np.int64)
+        
+        idx = np.searchsorted(self._starts_array, values, side='right') - 1
+        valid = idx >= 0
+        idx_clipped = np.where(valid, idx, 0)
+        inside = valid & (values < self._ends_array[idx_clipped])
+        
+        return np.where(inside, self._codes_array[idx_clipped], NO_SESSION).astype(np.int8)
+
 class SessionManager:
     """
     Manages trading across three global sessions with sequential deployment
@@ -74,36 +237,71 @@ class SessionManager:
         }
     }
     
-    def __init__(self):
-        """Initialize session manager"""
+    # Days of calendar built around a lookup that falls outside the index
+    CALENDAR_LOOKBACK_DAYS = 7
+    CALENDAR_HORIZON_DAYS = 366
+    
+    def __init__(self, calendar: SessionCalendar = None, verbose: bool = True,
+                 correlation_limits=None, ledger=None):
+        """
+        Initialize session manager
+        
+        Args:
+            calendar: Prebuilt SessionCalendar; built on first use if None
+            verbose: Print banners and session events (off for simulation)
+            correlation_limits: Optional risk_core.CorrelationLimits; caps
+                                each size by the cycle's correlated exposure
+            ledger: Optional session_ledger.SessionLedger; every recorded
+                    session result is appended to it
+        """
+        self.calendar = calendar
+        self.verbose = verbose
+        self.correlation_limits = correlation_limits
+        self.ledger = ledger
         self.current_session = None
         self.session_results = {}
+        self.day_exposure = {}
+        self.exposure_date = None   # Session date day_exposure belongs to
         self.nikkei_was_green = False
         
+        if not verbose:
+            return
+        
         print("╔" + "═" * 68 + "╗")
         print("║" + " " * 15 + "CLAUDE QUANT - SESSION MANAGER" + " " * 23 + "║")
         print("║" + " " * 21 + "Reference Implementation" + " " * 23 + "║")
         print("╚" + "═" * 68 + "╝")
         print("\n⚠️  Position sizing parameters are EXAMPLES (actual values proprietary)\n")
         
-    def get_active_session(self) -> str:
+    def get_active_session(self, timestamp: datetime = None) -> str:
         """
-        Determine which session is currently active
+        Determine which session is active at a timestamp
+        
+        Args:
+            timestamp: Timezone-aware datetime (defaults to now)
         
         Returns:
             str: 'nikkei', 'dax', 'nasdaq', or None
         """
-        now_utc = datetime.now(pytz.UTC)
+        if timestamp is None:
+            timestamp = datetime.now(pytz.UTC)
         
-        for session_name, config in self.SESSIONS.items():
-            session_tz = config['tz']
-            now_local = now_utc.astimezone(session_tz)
-            current_time = now_local.time()
-            
-            if config['open'] <= current_time < config['close']:
-                return session_name
+        return self.get_calendar(timestamp).session_at(timestamp)
+    
+    def get_calendar(self, timestamp: datetime) -> SessionCalendar:
+        """
+        Session calendar covering the timestamp
         
-        return None  # Overnight gap - no session active
+        The index is rebuilt (for about a year ahead) only when a lookup
+        falls outside the current range.
+        """
+        if self.calendar is None or not self.calendar.covers(timestamp):
+            day = timestamp.astimezone(pytz.UTC).date()
+            self.calendar = SessionCalendar(
+                self.SESSIONS,
+                day - timedelta(days=self.CALENDAR_LOOKBACK_DAYS),
+                day + timedelta(days=self.CALENDAR_HORIZON_DAYS))
+        return self.calendar
     
     def get_position_limit(self, market: str, direction: Literal['long', 'short']) -> float:
         """
@@ -128,19 +326,58 @@ class SessionManager:
         else:
             return config['short_limit_base']
     
-    def record_session_result(self, market: str, pnl_pct: float) -> None:
+    def record_session_result(
+        self,
+        market: str,
+        pnl_pct: float,
+        direction: Literal['long', 'short'] = None,
+        size: float = None,
+        session_date: date = None,
+        vix_regime: int = None
+    ) -> None:
         """
         Record session P&L for conditional expansion logic
         
+        With a ledger attached, size is required: a size of 0 records a
+        session that did not trade (nothing is appended), any other size
+        also needs direction, session_date and vix_regime. Nothing is
+        filled in with a default, so a ledger never holds guessed values.
+        
         Args:
             market: Session that closed
             pnl_pct: P&L as percentage
+            direction: Direction traded
+            size: Size traded, % of portfolio (0 = no trade)
+            session_date: Trading date of the cycle (the Nikkei session
+                          trades on the previous UTC date, so it cannot be
+                          derived from the close time)
+            vix_regime: VIX regime code the session was sized in
+        
+        Raises:
+            ValueError: If a ledger is attached and a field it needs is
+                        missing
         """
+        if self.ledger is not None:
+            if size is None:
+                raise ValueError("size is required when a ledger is attached "
+                                 "(0 for a session without a trade)")
+            if size != 0 and None in (direction, session_date, vix_regime):
+                raise ValueError("direction, session_date and vix_regime are required "
+                                 "to record a trade in the ledger")
+        
         self.session_results[market] = pnl_pct
         
+        if self.ledger is not None and size != 0:
+            # Only long limits expand after a green Nikkei
+            expanded = market != 'nikkei' and direction == 'long' and self.nikkei_was_green
+            self.ledger.record(market, direction, size, pnl_pct, session_date,
+                               expanded, vix_regime)
+        
         # Update Nikkei status for expansion
         if market == 'nikkei':
             self.nikkei_was_green = pnl_pct >= 0
+            if not self.verbose:
+                return
             status = "GREEN ✓" if self.nikkei_was_green else "RED ✗"
             print(f"\n{'─' * 70}")
             print(f"📊 NIKKEI SESSION CLOSED: {status}")
@@ -151,19 +388,57 @@ class SessionManager:
                 print(f"   🔒 Base limits maintained for DAX and Nasdaq")
             print(f"{'─' * 70}\n")
     
+    def record_position(self, market: str, direction: Literal['long', 'short'],
+                        size: float, session_date: date) -> None:
+        """
+        Record the size taken in a session (for correlation limits)
+        
+        Exposure is kept per cycle: a session date other than the one
+        already recorded starts a new day first, so a cycle that skips
+        Nikkei (no signal, holiday) still drops the previous cycle's
+        sizes.
+        
+        Args:
+            market: Session traded
+            direction: 'long' or 'short'
+            size: Size as % of portfolio
+            session_date: Local session date of the cycle (the calendar's
+                          session date)
+        """
+        if session_date != self.exposure_date:
+            self.new_day(session_date)
+        self.day_exposure[market] = size if direction == 'long' else -size
+    
+    def new_day(self, session_date: date = None) -> None:
+        """Clear the recorded exposure and start the cycle of session_date"""
+        self.day_exposure = {}
+        self.exposure_date = session_date
+    
     def calculate_position_size(
         self, 
         market: str, 
         direction: Literal['long', 'short'],
-        vix_multiplier: float = 1.0
+        vix_multiplier: float = 1.0,
+        session_date: date = None,
+        record: bool = False
     ) -> float:
         """
         Calculate final position size with VIX adjustment
         
+        With correlation limits, the size is further capped so the
+        cycle's correlated exposure (sessions already recorded for
+        session_date plus this one) stays within the limit. Exposure
+        recorded for another date is ignored. Sizing is read-only unless
+        record is set, so what-if calls never count as trades.
+        
         Args:
             market: Which market to size
             direction: 'long' or 'short'
             vix_multiplier: VIX regime multiplier (0.4 to 1.0)
+            session_date: Local session date of the cycle (None = the
+                          exposure already recorded)
+            record: Record the capped size as this session's exposure
+                    (requires session_date)
             
         Returns:
             float: Final position size as % of portfolio
@@ -171,9 +446,19 @@ class SessionManager:
         base_limit = self.get_position_limit(market, direction)
         adjusted = base_limit * vix_multiplier
         
+        if self.correlation_limits is not None:
+            exposures = self.day_exposure
+            if session_date is not None and session_date != self.exposure_date:
+                exposures = {}
+            adjusted = self.correlation_limits.cap(market, direction, adjusted, exposures)
+            if record:
+                if session_date is None:
+                    raise ValueError("session_date is required to record a position")
+                self.record_position(market, direction, adjusted, session_date)
+        
         return adjusted
     
-    def enforce_flat_overnight(self, has_positions: bool) -> None:
+    def enforce_flat_overnight(self, has_positions: bool, timestamp: datetime = None) -> bool:
         """
         CRITICAL: Ensure zero positions during overnight gaps
         
@@ -181,10 +466,16 @@ class SessionManager:
         
         Args:
             has_positions: Whether portfolio currently has positions
+            timestamp: Time of the check (defaults to now)
+            
+        Returns:
+            bool: True if an emergency flatten is required
         """
-        active_session = self.get_active_session()
+        active_session = self.get_active_session(timestamp)
         
         if active_session is None and has_positions:
+            if not self.verbose:
+                return True
             print("\n" + "!" * 70)
             print("🚨 CRITICAL: OVERNIGHT POSITION DETECTED")
             print("   Emergency flatten required - gap risk violation")
@@ -236,18 +527,12 @@ class VIXMonitor:
     VIX thresholds are standard market metrics (not proprietary)
     """
     
-    VIX_THRESHOLDS = {
-        'low': 15,
-        'normal': 20,
-        'elevated': 30
-    }
+    # Shared with vix_monitor.VIXMonitor (see risk_core.regimes)
+    REGIME_TABLE = MONITOR_TABLE
     
-    REGIME_MULTIPLIERS = {
-        'low': 1.00,      # Full size
-        'normal': 0.85,   # 15% reduction
-        'elevated': 0.65, # 35% reduction
-        'crisis': 0.40    # 60% reduction
-    }
+    VIX_THRESHOLDS = REGIME_TABLE.threshold_dict()    # 15 / 20 / 30
+    
+    REGIME_MULTIPLIERS = REGIME_TABLE.as_dict()       # 1.00 / 0.85 / 0.65 / 0.40
     
     def __init__(self, current_vix: float = 18.0):
         """
@@ -260,19 +545,11 @@ class VIXMonitor:
         
     def get_regime(self) -> str:
         """Classify current VIX regime"""
-        if self.vix < self.VIX_THRESHOLDS['low']:
-            return 'low'
-        elif self.vix < self.VIX_THRESHOLDS['normal']:
-            return 'normal'
-        elif self.vix < self.VIX_THRESHOLDS['elevated']:
-            return 'elevated'
-        else:
-            return 'crisis'
+        return self.REGIME_TABLE.name(self.vix)
     
     def get_multiplier(self) -> float:
         """Get position size multiplier based on VIX regime"""
-        regime = self.get_regime()
-        return self.REGIME_MULTIPLIERS[regime]
+        return self.REGIME_TABLE.multiplier(self.vix)
     
     def print_status(self):
         """Display current VIX status"""
@@ -389,11 +666,18 @@ def demonstrate_framework():
     print("═" * 70 + "\n")
 
 
-if __name__ == "__main__":
+def main():
     """
     Run framework demonstration
     
     This shows the ARCHITECTURE, not exact implementation.
     Actual trading requires proprietary signal generation.
     """
+    parser = argparse.ArgumentParser(
+        description="Session sequencing framework demonstration (takes no options)")
+    parser.parse_args()
     demonstrate_framework()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Multi-Session Event Simulator
+=============================
+
+Discrete-event simulation of the Nikkei → DAX → Nasdaq sequence, day after
+day, on synthetic intraday bars.
+
+Session windows come from a SessionCalendar, so open/close instants are
+DST-correct UTC times. Events (session open, bar, session close, flat
+check) are processed in time order from a heap. Bars for a session are
+generated in one vectorized draw at the open and scheduled lazily, one at
+a time, so the heap never holds more than a handful of events.
+
+At every step the simulator uses the real framework objects:
+- SessionManager.calculate_position_size for sizing (with VIX multiplier)
+- SessionManager.record_session_result at every close (with the date's
+  direction, size and VIX regime, so an optional SessionLedger gets the
+  full record); the Nikkei result drives conditional expansion for that
+  date's DAX and Nasdaq sessions
+- RiskFramework.check_portfolio_stop on the running daily P&L, bar by bar
+- SessionManager.enforce_flat_overnight at every session close, on the
+  position actually held at that instant (the strategy exits on its last
+  bar; anything still open is counted as a violation and force-flattened)
+
+Nothing is printed per event, so it is suitable for Monte Carlo runs.
+
+NOTE: Directions and bar returns are random - signal generation is
+proprietary and not included.
+
+Usage:
+    python scripts/session_simulator.py
+
+Requirements:
+    pip install pytz numpy
+"""
+
+import heapq
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from risk_simulator import RiskFramework
+from session_sequencing_reference import EPOCH_UTC, SessionCalendar, SessionManager
+
+# Event kinds, in processing priority for events at the same instant (the
+# flat check sees the position before the close handler clears it)
+FLAT_CHECK, SESSION_CLOSE, SESSION_OPEN, BAR = range(4)
+
+NS_PER_MINUTE = 60 * 10**9
+
+# Example simulation settings (illustrative, not production values)
+DEFAULT_LEVERAGE = 22
+DEFAULT_BAR_MINUTES = 5
+DEFAULT_BAR_VOL = 0.0012     # Per-bar market return standard deviation
+DEFAULT_LONG_PROBABILITY = 0.6
+
+class SessionSimulator:
+    """
+    Heap-driven simulator for sequential session trading
+
+    One instance runs one path; call run() with a seed for each Monte Carlo
+    path.
+    """
+
+    def __init__(self, start_date: date, end_date: date,
+                 vix_multiplier: float = 1.0,
+                 leverage: float = DEFAULT_LEVERAGE,
+                 bar_minutes: int = DEFAULT_BAR_MINUTES,
+                 bar_vol: float = DEFAULT_BAR_VOL,
+                 long_probability: float = DEFAULT_LONG_PROBABILITY,
+                 framework: RiskFramework = None,
+                 exit_before_close: bool = True,
+                 vix_regime: int = None,
+                 ledger=None):
+        """
+        Args:
+            start_date, end_date: Local session dates to simulate
+            vix_multiplier: VIX regime multiplier applied to every session
+            leverage: Portfolio leverage on position sizes
+            bar_minutes: Synthetic bar length
+            bar_vol: Per-bar return standard deviation
+            long_probability: Chance each session trades long
+            framework: RiskFramework for the daily stop (default if None)
+            exit_before_close: Strategy flattens on the session's last bar;
+                               False holds through the close, so every
+                               traded session ending in the overnight gap
+                               shows up as a flat violation
+            vix_regime: VIX regime code behind vix_multiplier (required
+                        with a ledger)
+            ledger: Optional session_ledger.SessionLedger; every traded
+                    session is appended to it
+        """
+        if ledger is not None and vix_regime is None:
+            raise ValueError("vix_regime is required when a ledger is attached")
+        self.calendar = SessionCalendar(SessionManager.SESSIONS, start_date, end_date,
+                                        weekdays=range(5))
+        self.vix_multiplier = vix_multiplier
+        self.leverage = leverage
+        self.bar_ns = bar_minutes * NS_PER_MINUTE
+        self.bar_vol = bar_vol
+        self.long_probability = long_probability
+        self.framework = framework if framework is not None else RiskFramework()
+        self.exit_before_close = exit_before_close
+        self.vix_regime = vix_regime
+        self.ledger = ledger
+
+    def run(self, seed: int = 0) -> dict:
+        """
+        Simulate every session in the calendar
+
+        Returns:
+            dict: Per-date arrays ('dates', 'session_pnl' [days x sessions],
+                  'daily_pnl', 'expanded', 'stopped') plus 'flat_violations',
+                  'events' and 'elapsed'
+        """
+        rng = np.random.default_rng(seed)
+        calendar = self.calendar
+        names = calendar.session_names
+        manager = SessionManager(calendar, verbose=False, ledger=self.ledger)
+        framework = self.framework
+
+        day_ordinals = sorted(set(calendar.dates))
+        day_index = {day: i for i, day in enumerate(day_ordinals)}
+        num_days = len(day_ordinals)
+
+        session_pnl = np.zeros((num_days, len(names)))
+        expanded = np.zeros(num_days, dtype=bool)
+        stopped = np.zeros(num_days, dtype=bool)
+        nikkei_green = np.zeros(num_days, dtype=bool)
+
+        # Daily P&L accumulates from the Nikkei open through the Nasdaq close
+        # of the same local session date
+        day_pnl = np.zeros(num_days)
+
+        queue = []
+        seq = 0
+        for i, (start, end) in enumerate(zip(calendar.starts, calendar.ends)):
+            queue.append((start, SESSION_OPEN, seq, i))
+            queue.append((end, FLAT_CHECK, seq + 1, i))
+            queue.append((end, SESSION_CLOSE, seq + 2, i))
+            seq += 3
+        heapq.heapify(queue)
+
+        # Open-position state for the session currently trading
+        position = 0.0          # Signed exposure (% of portfolio x leverage)
+        traded = (None, 0.0)    # (direction, size %) taken at the open
+        bars = None
+        bar_cursor = 0
+        flat_violations = 0
+        events = 0
+
+        start_time = time.perf_counter()
+
+        while queue:
+            instant, kind, _, segment = heapq.heappop(queue)
+            events += 1
+            code = calendar.codes[segment]
+            day = day_index[calendar.dates[segment]]
+
+            if kind == BAR:
+                if position == 0.0 or bar_cursor >= len(bars):
+                    continue
+                pnl = position * bars[bar_cursor]
+                session_pnl[day, code] += pnl
+                day_pnl[day] += pnl
+                bar_cursor += 1
+
+                if framework.check_portfolio_stop(day_pnl[day]):
+                    # Hard stop: flatten and stand down for the rest of the day
+                    stopped[day] = True
+                    position = 0.0
+                    continue
+
+                if bar_cursor == len(bars) and self.exit_before_close:
+                    # Strategy exit on the last bar before the close
+                    position = 0.0
+                    continue
+
+                next_instant = instant + self.bar_ns
+                if next_instant < calendar.ends[segment]:
+                    heapq.heappush(queue, (next_instant, BAR, seq, segment))
+                    seq += 1
+
+            elif kind == SESSION_OPEN:
+                traded = (None, 0.0)
+                if stopped[day]:
+                    continue
+                market = names[code]
+                if market != 'nikkei':
+                    # The next date's Nikkei session can close before this
+                    # date's Nasdaq opens, so restore this date's outcome
+                    manager.nikkei_was_green = bool(nikkei_green[day])
+                    expanded[day] = nikkei_green[day]
+
+                direction = 'long' if rng.random() < self.long_probability else 'short'
+                size = manager.calculate_position_size(
+                    market, direction, self.vix_multiplier,
+                    date.fromordinal(calendar.dates[segment]), record=True)
+                position = size * self.leverage * (1 if direction == 'long' else -1)
+                traded = (direction, size)
+
+                num_bars = int((calendar.ends[segment] - instant) // self.bar_ns)
+                bars = rng.normal(0.0, self.bar_vol, size=num_bars)
+                bar_cursor = 0
+                if num_bars:
+                    heapq.heappush(queue, (instant, BAR, seq, segment))
+                    seq += 1
+
+            elif kind == SESSION_CLOSE:
+                # Anything still open was counted by the flat check; the
+                # close force-flattens it
+                position = 0.0
+                market = names[code]
+                if market != 'nikkei':
+                    manager.nikkei_was_green = bool(nikkei_green[day])
+                manager.record_session_result(market, session_pnl[day, code], *traded,
+                                              date.fromordinal(calendar.dates[segment]),
+                                              self.vix_regime)
+                if market == 'nikkei':
+                    nikkei_green[day] = manager.nikkei_was_green
+
+            else:  # FLAT_CHECK
+                timestamp = _ns_to_datetime(instant)
+                if manager.enforce_flat_overnight(position != 0.0, timestamp):
+                    flat_violations += 1
+                    position = 0.0
+
+        return {
+            'dates': [date.fromordinal(day) for day in day_ordinals],
+            'session_names': names,
+            'session_pnl': session_pnl,
+            'daily_pnl': day_pnl,
+            'expanded': expanded,
+            'stopped': stopped,
+            'flat_violations': flat_violations,
+            'events': events,
+            'elapsed': time.perf_counter() - start_time
+        }
+
+def _ns_to_datetime(epoch_ns: int) -> datetime:
+    """Epoch nanoseconds -> aware UTC datetime (microsecond precision)"""
+    return EPOCH_UTC + timedelta(microseconds=epoch_ns // 1000)
+
+def main():
+    """Simulate three years and summarize the results"""
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - MULTI-SESSION EVENT SIMULATOR")
+    print("=" * 70 + "\n")
+
+    simulator = SessionSimulator(date(2023, 1, 2), date(2025, 12, 31))
+    result = simulator.run(seed=7)
+
+    daily = result['daily_pnl']
+    equity = np.cumprod(1 + daily / 100)
+    drawdown = (equity / np.maximum.accumulate(equity) - 1) * 100
+
+    print(f"Trading days:        {len(result['dates']):,}")
+    print(f"Events processed:    {result['events']:,} "
+          f"in {result['elapsed']:.2f}s ({result['events'] / result['elapsed']:,.0f}/sec)")
+    print(f"Expansion days:      {int(result['expanded'].sum()):,}")
+    print(f"Hard stops:          {int(result['stopped'].sum()):,}")
+    print(f"Flat violations:     {result['flat_violations']}")
+
+    print(f"\n{'Session':<10} {'Mean P&L':>10} {'Win Rate':>10}")
+    print("-" * 70)
+    for code, name in enumerate(result['session_names']):
+        pnl = result['session_pnl'][:, code]
+        traded = pnl != 0
+        win_rate = (pnl[traded] > 0).mean() * 100 if traded.any() else 0.0
+        print(f"{name:<10} {pnl.mean():>+9.3f}% {win_rate:>9.1f}%")
+
+    print(f"\nFinal equity multiple: {equity[-1]:.3f}x")
+    print(f"Max drawdown:          {drawdown.min():.2f}%")
+
+    print("\n" + "=" * 70)
+    print("NOTE: Random synthetic bars and directions - illustrates mechanics only.")
+    print("=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Startup-Time Benchmark
+======================
+
+Measures the cold-start cost of the risk path in fresh interpreters:
+each module is imported in a new `python -X importtime` process, so the
+numbers include every transitive import and no module caching between
+runs.
+
+For every module it reports the import time it adds over a bare
+interpreter (sum of the per-module self times from -X importtime, minus
+the interpreter's own startup imports), the median process wall time,
+and whether any heavy module (yfinance, matplotlib) was pulled in. No
+module may import those at load time - they are imported by the
+functions that use them.
+
+With --budget every module in IMPORT_BUDGETS_MS is also checked against
+its import-time budget (CI runs this on every push).
+
+Usage:
+    python scripts/startup_benchmark.py
+    python scripts/startup_benchmark.py --runs 10
+    python scripts/startup_benchmark.py --budget
+
+Requirements:
+    (standard library only)
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Modules on the order/risk path - none may import a HEAVY_MODULES entry
+RISK_PATH_MODULES = ('risk_core', 'risk_simulator', 'pretrade_check',
+                     'session_sequencing_reference', 'vix_monitor')
+
+HEAVY_MODULES = ('yfinance', 'matplotlib')
+
+# Added import time (ms over a bare interpreter) allowed per module; about
+# 3x the local measurement to absorb slower CI runners
+IMPORT_BUDGETS_MS = {
+    'claude_quant': 50,
+    'risk_core': 20,
+    'risk_simulator': 300,
+    'pretrade_check': 400,
+    'session_sequencing_reference': 350,
+    'vix_monitor': 100,
+    'verify_performance': 1500,
+    'visualize_performance': 1200,
+}
+
+def measure_import(module, runs=5):
+    """
+    Import a module in fresh interpreters with -X importtime
+
+    Args:
+        module: Module name (importable from the scripts directory), or
+                None for a bare interpreter
+        runs: Number of fresh processes; medians are reported
+
+    Returns:
+        dict: 'module', 'import_ms' (median summed self time), 'wall_ms'
+              (median process wall time), 'modules' (set of imported
+              top-level package names)
+    """
+    import_times, wall_times = [], []
+    imported = set()
+    for _ in range(runs):
+        start = time.perf_counter()
+        code = 'pass' if module is None else f'import {module}'
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                              cwd=SCRIPTS_DIR, capture_output=True, text=True)
+        wall_times.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+        self_us = 0
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            fields = line[len('import time:'):].split('|')
+            self_us += int(fields[0])
+            imported.add(fields[2].strip().split('.')[0])
+        import_times.append(self_us / 1000)
+
+    return {
+        'module': module,
+        'import_ms': statistics.median(import_times),
+        'wall_ms': statistics.median(wall_times) * 1000,
+        'modules': imported
+    }
+
+def main():
+    """Measure import times and check for heavy imports (and budgets)"""
+
+    parser = argparse.ArgumentParser(description="Cold-start import benchmark")
+    parser.add_argument('--runs', type=int, default=5, help="Fresh interpreters per module")
+    parser.add_argument('--budget', action='store_true',
+                        help="Fail if a module exceeds its IMPORT_BUDGETS_MS entry")
+    parser.add_argument('modules', nargs='*')
+    args = parser.parse_args()
+    modules = args.modules or list(IMPORT_BUDGETS_MS if args.budget else RISK_PATH_MODULES)
+
+    print("\n" + "=" * 78)
+    print("CLAUDE QUANT - STARTUP-TIME BENCHMARK")
+    print("=" * 78 + "\n")
+
+    baseline = measure_import(None, args.runs)
+    print(f"Bare interpreter: {baseline['import_ms']:.1f} ms startup imports, "
+          f"{baseline['wall_ms']:.1f} ms wall\n")
+    print(f"{'Module':<30} {'+Imports':>10} {'Budget':>8} {'Wall':>10}  Heavy modules")
+    print("-" * 78)
+
+    clean, within_budget = True, True
+    for module in modules:
+        result = measure_import(module, args.runs)
+        added_ms = result['import_ms'] - baseline['import_ms']
+        heavy = sorted(set(HEAVY_MODULES) & result['modules'])
+        clean &= not heavy
+        budget = IMPORT_BUDGETS_MS.get(module)
+        over = args.budget and budget is not None and added_ms > budget
+        within_budget &= not over
+        budget_text = f"{budget}ms" if budget is not None else "-"
+        print(f"{module:<30} {added_ms:>8.1f}ms {budget_text:>8} {result['wall_ms']:>8.1f}ms  "
+              f"{', '.join(heavy) if heavy else '✓ none'}{'  ❌ over budget' if over else ''}")
+
+    print("\n" + "=" * 78)
+    print("✅ No heavy imports at module load" if clean
+          else "❌ Heavy modules imported at module load")
+    if args.budget:
+        print("✅ All modules within their import budget" if within_budget
+              else "❌ Import budget exceeded")
+    print("=" * 78 + "\n")
+    sys.exit(0 if clean and within_budget else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Tick Replay Harness
+===================
+
+Replays recorded futures ticks through SessionManager, RiskFramework and
+the intraday P&L aggregator, for regression testing session logic
+against local data.
+
+Tick files are NumPy structured arrays (TICK_DTYPE) saved as .npy, so
+they open memory-mapped and batches are zero-copy record views. A CSV
+(timestamp, instrument, price, size) is converted once, in chunks, to a
+.npy next to it and reused until the CSV changes.
+
+For each batch, ticks are labeled with their calendar segment (one
+session on one local date) in one searchsorted. Runs of ticks inside the
+same segment go to IntradayPnL.replay in a single vectorized call; the
+harness handles the events between runs:
+- session open: size with SessionManager.calculate_position_size and
+  fill at the instrument's first tick in the session
+- session close: the strategy exits at the last tick of the session
+  (unless flatten_at_close is off), enforce_flat_overnight runs on the
+  position still held at the close instant (a violation is counted and
+  force-flattened), and the result is recorded with its direction, size,
+  date and VIX regime (the Nikkei result drives conditional expansion;
+  an optional SessionLedger gets every traded session)
+- hard stop: the aggregator stops on the crossing tick; the position
+  is flattened and no new session opens until the next Nikkei open
+
+Replay runs at full speed by default, or paced against the wall clock at
+`speed` x real time.
+
+NOTE: Trade directions come from a caller-supplied function - signal
+generation is proprietary and not included. The demo uses random
+directions on synthetic ticks.
+
+Usage:
+    python scripts/tick_replay.py                       # synthetic demo
+    python scripts/tick_replay.py path/to/ticks.csv     # or .npy
+    python scripts/tick_replay.py ticks.npy --speed 3600
+
+Requirements:
+    pip install pytz numpy pandas
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from backtest_replay import STARTING_CAPITAL
+from pnl_aggregator import CONTRACT_MULTIPLIERS, INSTRUMENTS, IntradayPnL, synthetic_ticks
+from risk_core import REGIME_NAMES
+from risk_simulator import RiskFramework
+from session_labeler import calendar_for_range
+from session_sequencing_reference import EPOCH_UTC, SessionManager
+
+# One record per tick; instrument is a code into INSTRUMENTS
+TICK_DTYPE = np.dtype([('ts', '<i8'), ('instrument', 'i1'), ('price', '<f8'), ('size', '<f4')])
+
+DEFAULT_BATCH_SIZE = 1_000_000
+DEFAULT_LEVERAGE = 22
+
+def tick_path_for(csv_path):
+    """data/foo.csv -> data/foo.npy"""
+    return os.path.splitext(csv_path)[0] + '.npy'
+
+def convert_csv(csv_path, npy_path=None, chunksize=1_000_000):
+    """
+    Convert a tick CSV to a .npy of TICK_DTYPE records, chunk by chunk
+
+    Timestamps are parsed as UTC (naive values are taken as UTC) and must
+    be non-decreasing. The output is sized from the line count and cut to
+    the rows actually parsed (blank lines are skipped by the parser).
+
+    Returns:
+        str: Path of the written file
+    """
+    if npy_path is None:
+        npy_path = tick_path_for(csv_path)
+
+    with open(csv_path) as f:
+        num_rows = sum(1 for _ in f) - 1
+
+    codes = {name: code for code, name in enumerate(INSTRUMENTS)}
+    tmp_path = f"{npy_path}.tmp-{os.getpid()}.npy"
+    trimmed_path = f"{npy_path}.tmp-{os.getpid()}-trimmed.npy"
+    out = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=TICK_DTYPE, shape=(num_rows,))
+    try:
+        row = 0
+        last_ts = np.iinfo(np.int64).min
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            ts = (pd.to_datetime(chunk['timestamp'], utc=True).dt.tz_localize(None)
+                  .to_numpy(dtype='datetime64[ns]').view(np.int64))
+            if len(ts) and (ts[0] < last_ts or np.any(np.diff(ts) < 0)):
+                raise ValueError(f"Timestamps in {csv_path} are not sorted")
+            instrument = chunk['instrument'].map(codes)
+            if instrument.isna().any():
+                raise ValueError(f"Unknown instrument in {csv_path}; expected one of {INSTRUMENTS}")
+
+            stop = row + len(chunk)
+            out['ts'][row:stop] = ts
+            out['instrument'][row:stop] = instrument.to_numpy()
+            out['price'][row:stop] = chunk['price'].to_numpy(dtype=float)
+            out['size'][row:stop] = (chunk['size'].to_numpy(dtype=float)
+                                     if 'size' in chunk else 0.0)
+            row = stop
+            if len(ts):
+                last_ts = ts[-1]
+        out.flush()
+        del out
+        if row < num_rows:
+            np.save(trimmed_path, np.load(tmp_path, mmap_mode='r')[:row])
+            os.replace(trimmed_path, npy_path)
+        else:
+            os.replace(tmp_path, npy_path)
+    finally:
+        for path in (tmp_path, trimmed_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    return npy_path
+
+def load_ticks(path):
+    """
+    Memory-map a tick file (.npy), converting a CSV on first use
+
+    Raises:
+        ValueError: If the file is not TICK_DTYPE or its timestamps
+                    decrease anywhere
+
+    Returns:
+        np.memmap: Read-only TICK_DTYPE records
+    """
+    if path.endswith('.csv'):
+        npy_path = tick_path_for(path)
+        if not (os.path.exists(npy_path) and os.path.getmtime(npy_path) >= os.path.getmtime(path)):
+            convert_csv(path, npy_path)
+        path = npy_path
+
+    ticks = np.load(path, mmap_mode='r')
+    if ticks.dtype != TICK_DTYPE:
+        raise ValueError(f"{path} has dtype {ticks.dtype}, expected {TICK_DTYPE}")
+
+    # Checked batch by batch (with the overlap tick) so memory stays bounded
+    for start in range(0, len(ticks), DEFAULT_BATCH_SIZE):
+        ts = ticks['ts'][max(start - 1, 0):start + DEFAULT_BATCH_SIZE]
+        if np.any(ts[1:] < ts[:-1]):
+            raise ValueError(f"Timestamps in {path} are not sorted")
+    return ticks
+
+def iter_batches(ticks, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield consecutive zero-copy record views of at most batch_size ticks"""
+    for start in range(0, len(ticks), batch_size):
+        yield ticks[start:start + batch_size]
+
+class TickReplay:
+    """
+    Drive session and risk logic from a tick array
+
+    One instance replays one file; call run() once.
+    """
+
+    def __init__(self, ticks, direction_fn=None, vix_level: float = None,
+                 framework: RiskFramework = None, speed: float = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE,
+                 leverage: float = DEFAULT_LEVERAGE,
+                 starting_capital: float = STARTING_CAPITAL,
+                 flatten_at_close: bool = True, ledger=None):
+        """
+        Args:
+            ticks: TICK_DTYPE records sorted by ts (array or memmap)
+            direction_fn: direction_fn(market, date) -> 'long', 'short' or
+                          None (stay flat); None never trades
+            vix_level: VIX level for the sizing regime (full size if None)
+            framework: RiskFramework for regimes and the daily stop
+            speed: Replay at speed x wall-clock time (None = full speed);
+                   pacing is per run of ticks, so use a smaller batch_size
+                   for smooth pacing
+            batch_size: Ticks per zero-copy batch
+            leverage: Portfolio leverage applied to % position sizes
+            starting_capital: Account equity at the start
+            flatten_at_close: Exit every position at the session's last
+                              tick; False holds it, so sessions that end
+                              in the overnight gap count as flat violations
+            ledger: Optional session_ledger.SessionLedger; every traded
+                    session is appended to it (needs vix_level)
+        """
+        if ledger is not None and vix_level is None:
+            raise ValueError("vix_level is required when a ledger is attached")
+        self.ticks = ticks
+        self.direction_fn = direction_fn
+        self.framework = framework if framework is not None else RiskFramework()
+        regime = None if vix_level is None else self.framework.get_vix_regime(vix_level)
+        self.vix_multiplier = 1.0 if regime is None else self.framework.regime_multipliers[regime]
+        self.vix_regime = None if regime is None else REGIME_NAMES.index(regime)
+        self.speed = speed
+        self.batch_size = batch_size
+        self.leverage = leverage
+        self.equity = float(starting_capital)
+        self.flatten_at_close = flatten_at_close
+        self.ledger = ledger
+
+        self.calendar = None
+        self.manager = None
+        self.pnl = IntradayPnL(self.equity, self.framework)
+        self._instrument_codes = {name: code for code, name in enumerate(INSTRUMENTS)}
+
+    def run(self) -> dict:
+        """
+        Replay every tick
+
+        Returns:
+            dict: 'ticks', 'session_events', 'events', 'elapsed',
+                  'events_per_sec', 'sessions' [(date, market, pnl %)],
+                  'stops', 'flat_violations', 'final_equity'
+        """
+        results = {'sessions': [], 'stops': 0, 'flat_violations': 0, 'session_events': 0}
+        if len(self.ticks) == 0:
+            return {**results, 'ticks': 0, 'events': 0, 'elapsed': 0.0,
+                    'events_per_sec': 0.0, 'final_equity': self.equity}
+
+        self.calendar = calendar_for_range(int(self.ticks['ts'][0]), int(self.ticks['ts'][-1]))
+        self.manager = SessionManager(self.calendar, verbose=False, ledger=self.ledger)
+        starts = np.asarray(self.calendar.starts, dtype=np.int64)
+        ends = np.asarray(self.calendar.ends, dtype=np.int64)
+
+        self._segment = -1
+        self._open = None         # (code, contracts, pnl at open, direction, size %) while in a session
+        self._pending = None      # (code, signed size %, direction) waiting for the first tick
+        self._cycle_date = None   # Nikkei date that started the current daily cycle
+        self._nikkei_green = {}   # session date -> Nikkei result, for expansion
+        self._results = results
+
+        start_time = time.perf_counter()
+        self._wall_origin = None
+
+        for batch in iter_batches(self.ticks, self.batch_size):
+            ts = batch['ts']
+            idx = np.searchsorted(starts, ts, side='right') - 1
+            clipped = np.maximum(idx, 0)
+            segments = np.where((idx >= 0) & (ts < ends[clipped]), idx, -1)
+
+            bounds = np.flatnonzero(segments[1:] != segments[:-1]) + 1
+            run_starts = np.concatenate(([0], bounds))
+            run_ends = np.concatenate((bounds, [len(batch)]))
+            codes = batch['instrument'].astype(np.intp)
+            prices = batch['price']
+
+            for lo, hi in zip(run_starts.tolist(), run_ends.tolist()):
+                segment = int(segments[lo])
+                if segment != self._segment:
+                    self._transition(segment, int(ts[lo]))
+                if self.speed:
+                    self._pace(int(ts[lo]))
+                self._process_run(codes[lo:hi], prices[lo:hi])
+
+        self._transition(-1, int(self.ticks['ts'][-1]))
+        elapsed = time.perf_counter() - start_time
+
+        events = len(self.ticks) + results['session_events']
+        self.equity += self.pnl.pnl
+        return {
+            **results,
+            'ticks': len(self.ticks),
+            'events': events,
+            'elapsed': elapsed,
+            'events_per_sec': events / elapsed if elapsed > 0 else float('inf'),
+            'final_equity': self.equity
+        }
+
+    def _pace(self, epoch_ns: int) -> None:
+        """Sleep until the wall clock catches up with the scaled tick time"""
+        if self._wall_origin is None:
+            self._wall_origin = (time.perf_counter(), epoch_ns)
+        wall_start, tick_start = self._wall_origin
+        delay = (epoch_ns - tick_start) / 1e9 / self.speed - (time.perf_counter() - wall_start)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _transition(self, segment: int, epoch_ns: int) -> None:
+        """Close the current segment (if any) and open the next one"""
+        calendar = self.calendar
+        if self._segment >= 0:
+            if self.flatten_at_close:
+                self._flatten()
+            # Check the position actually held at the close instant, before
+            # the close handler force-flattens it (skipped if the file ends
+            # mid-session)
+            close_ns = calendar.ends[self._segment]
+            if close_ns <= epoch_ns:
+                timestamp = EPOCH_UTC + timedelta(microseconds=close_ns // 1000)
+                position = self._open is not None and self.pnl.positions[self._open[0]] != 0
+                if self.manager.enforce_flat_overnight(position, timestamp):
+                    self._results['flat_violations'] += 1
+            self._close_session(calendar.session_names[calendar.codes[self._segment]],
+                                calendar.dates[self._segment])
+
+        self._segment = segment
+        self._open = None
+        self._pending = None
+        if segment >= 0:
+            market = calendar.session_names[calendar.codes[segment]]
+            self._open_session(market, calendar.dates[segment])
+
+    def _open_session(self, market: str, day: int) -> None:
+        self._results['session_events'] += 1
+
+        if market == 'nikkei' and day != self._cycle_date:
+            # Each Nikkei open starts a new daily cycle for the loss stop
+            self._cycle_date = day
+            self.equity += self.pnl.pnl
+            self.pnl.new_day(self.equity)
+        else:
+            # The next date's Nikkei session can close before this date's
+            # Nasdaq opens, so restore this date's outcome
+            self.manager.nikkei_was_green = self._nikkei_green.get(day, False)
+
+        if self.pnl.stopped or self.direction_fn is None:
+            return
+        direction = self.direction_fn(market, day)
+        if direction is None:
+            return
+
+        size = self.manager.calculate_position_size(market, direction, self.vix_multiplier,
+                                                    date.fromordinal(day), record=True)
+        code = self._instrument_codes[SessionManager.SESSIONS[market]['instrument']]
+        self._pending = (code, size if direction == 'long' else -size, direction)
+
+    def _process_run(self, codes, prices) -> None:
+        fills = []
+        if self._pending is not None:
+            code, size, direction = self._pending
+            first = np.flatnonzero(codes == code)
+            if len(first):
+                i = int(first[0])
+                price = float(prices[i])
+                notional = size / 100 * self.leverage * self.pnl.start_equity
+                contracts = notional / (price * CONTRACT_MULTIPLIERS[code])
+                fills.append((i, code, contracts, price))
+                self._open = (code, contracts, self.pnl.pnl, direction, abs(size))
+                self._pending = None
+
+        was_stopped = self.pnl.stopped
+        self.pnl.replay(codes, prices, fills)
+        if self.pnl.stopped and not was_stopped:
+            self._results['stops'] += 1
+            self._flatten()
+
+    def _flatten(self) -> None:
+        if self._open is None:
+            return
+        code = self._open[0]
+        position = self.pnl.positions[code]
+        if position:
+            self.pnl.on_fill(code, -position, self.pnl.last_prices[code])
+
+    def _close_session(self, market: str, day: int) -> None:
+        self._results['session_events'] += 1
+        pnl_pct, direction, size = 0.0, None, 0.0
+        if self._open is not None:
+            self._flatten()
+            pnl_pct = (self.pnl.pnl - self._open[2]) / self.pnl.start_equity * 100
+            direction, size = self._open[3], self._open[4]
+            self._results['sessions'].append((day, market, pnl_pct))
+
+        if market != 'nikkei':
+            self.manager.nikkei_was_green = self._nikkei_green.get(day, False)
+        self.manager.record_session_result(market, pnl_pct, direction, size,
+                                           date.fromordinal(day), self.vix_regime)
+        if market == 'nikkei':
+            self._nikkei_green[day] = self.manager.nikkei_was_green
+
+def write_synthetic_ticks(path, num_ticks, start: datetime, days: int, seed=0):
+    """
+    Write a random-walk tick file spread evenly over `days` from `start`
+
+    Returns:
+        str: path
+    """
+    codes, prices = synthetic_ticks(num_ticks, seed)
+    rng = np.random.default_rng(seed)
+    start_ns = int((start - EPOCH_UTC).total_seconds()) * 10**9
+    ts = np.sort(rng.integers(start_ns, start_ns + days * 86400 * 10**9, size=num_ticks))
+
+    ticks = np.lib.format.open_memmap(path, mode='w+', dtype=TICK_DTYPE, shape=(num_ticks,))
+    ticks['ts'] = ts
+    ticks['instrument'] = codes
+    ticks['price'] = prices
+    ticks['size'] = 1.0
+    ticks.flush()
+    return path
+
+def main():
+    """Replay a tick file (or synthetic ticks) and report throughput"""
+
+    parser = argparse.ArgumentParser(description="Replay ticks through the session and risk logic")
+    parser.add_argument('path', nargs='?', help="Tick .npy or .csv (synthetic demo if omitted)")
+    parser.add_argument('--speed', type=float, help="Pace at speed x real time (default: full speed)")
+    parser.add_argument('--vix', type=float, help="VIX level for the sizing regime")
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print("CLAUDE QUANT - TICK REPLAY HARNESS")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = args.path
+        if path is None:
+            path = os.path.join(tmp_dir, 'synthetic_ticks.npy')
+            write_synthetic_ticks(path, 10_000_000, datetime(2025, 1, 6, tzinfo=pytz.UTC),
+                                  days=60, seed=args.seed)
+            print("Generated 10,000,000 synthetic ticks over 60 days")
+
+        try:
+            ticks = load_ticks(path)
+        except FileNotFoundError:
+            print(f"ERROR: Could not find {path}")
+            sys.exit(1)
+
+        rng = random.Random(args.seed)
+        replay = TickReplay(ticks, direction_fn=lambda market, day: 'long' if rng.random() < 0.6 else 'short',
+                            vix_level=args.vix, speed=args.speed,
+                            batch_size=DEFAULT_BATCH_SIZE if args.speed is None else 10_000)
+        results = replay.run()
+
+    sessions = results['sessions']
+    print(f"Ticks replayed:    {results['ticks']:,}")
+    print(f"Session events:    {results['session_events']:,}")
+    print(f"Elapsed:           {results['elapsed']:.2f}s "
+          f"({results['events_per_sec']:,.0f} events/sec)")
+    print(f"Sessions traded:   {len(sessions):,}")
+    print(f"Hard stops:        {results['stops']}")
+    print(f"Flat violations:   {results['flat_violations']}")
+    print(f"Final equity:      ${results['final_equity']:,.0f}")
+
+    if sessions:
+        print(f"\n{'Session':<10} {'Count':>7} {'Mean P&L':>10} {'Win Rate':>10}")
+        print("-" * 70)
+        for market in SessionManager.SESSIONS:
+            pnl = np.array([p for _, m, p in sessions if m == market])
+            if len(pnl):
+                print(f"{market:<10} {len(pnl):>7} {pnl.mean():>+9.3f}% {(pnl > 0).mean() * 100:>9.1f}%")
+
+    print("\n" + "=" * 70)
+    print("NOTE: Random directions - illustrates mechanics only.")
+    print("=" * 70 + "\n")
+
+if __name__ == "__main__":
+    main()
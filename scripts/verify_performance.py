@@ -8,20 +8,29 @@ made by Claude Quant. All calculations are transparent and reproducible.
 
 Usage:
     python verify_performance.py
+    python verify_performance.py --streaming --file path/to/large_pnl.csv
+    python verify_performance.py --force        # ignore the report cache
 
 Requirements:
     pip install pandas numpy
 """
 
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from report_cache import ReportCache
+from series_store import load_table
+
+LIVE_DATA_FILE = 'data/live_simulation_dec3_jan16.csv'
+
+# Assuming risk-free rate of ~4.5% annually (~0.018% daily)
+RISK_FREE_DAILY = 0.00018
+
 def load_data(filepath):
-    """Load performance data from CSV"""
-    df = pd.read_csv(filepath)
-    df['date'] = pd.to_datetime(df['date'])
-    return df
+    """Load performance data from CSV (via its columnar store)"""
+    return load_table(filepath)
 
 def calculate_basic_stats(df):
     """Calculate basic performance statistics"""
@@ -47,6 +56,8 @@ def calculate_basic_stats(df):
     worst_day = df.loc[df['daily_return_pct'].idxmin()]
     
     return {
+        'start_date': df.iloc[0]['date'],
+        'end_date': df.iloc[-1]['date'],
         'starting_value': starting_value,
         'ending_value': ending_value,
         'total_return': total_return,
@@ -65,9 +76,7 @@ def calculate_risk_metrics(df):
     returns = df['daily_return_pct'] / 100
     
     # Sharpe Ratio (annualized)
-    # Assuming risk-free rate of ~4.5% annually (~0.018% daily)
-    risk_free_daily = 0.00018
-    excess_returns = returns - risk_free_daily
+    excess_returns = returns - RISK_FREE_DAILY
     sharpe = (excess_returns.mean() / returns.std()) * np.sqrt(252)
     
     # Sortino Ratio (annualized)
@@ -90,7 +99,140 @@ def calculate_risk_metrics(df):
         'volatility': volatility
     }
 
-def print_report(basic_stats, risk_metrics, df):
+class StreamingStats:
+    """
+    Single-pass accumulators for the verification statistics
+    
+    Consumes the P&L file chunk by chunk and keeps only O(1) state:
+    Welford mean/variance of returns and of the downside returns (chunks
+    are merged with the parallel-variance update), the running equity
+    level, peak and worst drawdown, win/loss counts, best/worst days and
+    the first/last rows. Memory use is independent of file size.
+    """
+    
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.down_count = 0
+        self.down_mean = 0.0
+        self.down_m2 = 0.0
+        self.pct_count = 0
+        self.pct_mean = 0.0
+        self.wins = 0
+        self.losses = 0
+        self.equity = 1.0
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+        self.best = None
+        self.worst = None
+        self.first = None
+        self.last = None
+    
+    @staticmethod
+    def _merge(count, mean, m2, values):
+        """Merge a chunk into (count, mean, M2) - Chan et al. parallel update"""
+        n = len(values)
+        if n == 0:
+            return count, mean, m2
+        chunk_mean = values.mean()
+        chunk_m2 = ((values - chunk_mean) ** 2).sum()
+        total = count + n
+        delta = chunk_mean - mean
+        mean = mean + delta * n / total
+        m2 = m2 + chunk_m2 + delta * delta * count * n / total
+        return total, mean, m2
+    
+    def update(self, chunk):
+        """
+        Add a chunk with 'date', 'daily_return_pct' and 'account_value_usd'
+        """
+        if len(chunk) == 0:
+            return
+        
+        pct = chunk['daily_return_pct'].to_numpy(dtype=float)
+        returns = pct / 100
+        dates = chunk['date'].to_numpy()
+        
+        if self.first is None:
+            self.first = (dates[0], chunk['account_value_usd'].iloc[0])
+        self.last = (dates[-1], chunk['account_value_usd'].iloc[-1])
+        
+        self.count, self.mean, self.m2 = self._merge(self.count, self.mean, self.m2, returns)
+        self.pct_count, self.pct_mean, _ = self._merge(self.pct_count, self.pct_mean, 0.0, pct)
+        self.down_count, self.down_mean, self.down_m2 = self._merge(
+            self.down_count, self.down_mean, self.down_m2, returns[returns < 0])
+        
+        self.wins += int((pct > 0).sum())
+        self.losses += int((pct < 0).sum())
+        
+        # First occurrence wins ties, matching idxmax/idxmin
+        best_idx, worst_idx = pct.argmax(), pct.argmin()
+        if self.best is None or pct[best_idx] > self.best[1]:
+            self.best = (dates[best_idx], pct[best_idx])
+        if self.worst is None or pct[worst_idx] < self.worst[1]:
+            self.worst = (dates[worst_idx], pct[worst_idx])
+        
+        cumulative = self.equity * np.cumprod(1 + returns)
+        running_max = np.maximum(np.maximum.accumulate(cumulative), self.peak)
+        drawdown = ((cumulative / running_max) - 1) * 100
+        self.max_drawdown = min(self.max_drawdown, drawdown.min())
+        self.equity = cumulative[-1]
+        self.peak = running_max[-1]
+    
+    def basic_stats(self):
+        """Same keys as calculate_basic_stats()"""
+        start_date, starting_value = self.first
+        end_date, ending_value = self.last
+        return {
+            'start_date': pd.Timestamp(start_date),
+            'end_date': pd.Timestamp(end_date),
+            'starting_value': starting_value,
+            'ending_value': ending_value,
+            'total_return': ((ending_value / starting_value) - 1) * 100,
+            'num_days': self.count,
+            'wins': self.wins,
+            'losses': self.losses,
+            'win_rate': (self.wins / self.count) * 100,
+            'avg_daily': self.pct_mean,
+            'best_day': {'date': pd.Timestamp(self.best[0]), 'daily_return_pct': self.best[1]},
+            'worst_day': {'date': pd.Timestamp(self.worst[0]), 'daily_return_pct': self.worst[1]}
+        }
+    
+    def risk_metrics(self):
+        """Same keys as calculate_risk_metrics()"""
+        std = np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+        down_std = (np.sqrt(self.down_m2 / (self.down_count - 1))
+                    if self.down_count > 1 else np.nan)
+        excess_mean = self.mean - RISK_FREE_DAILY
+        return {
+            'sharpe_ratio': (excess_mean / std) * np.sqrt(252),
+            'sortino_ratio': (excess_mean / down_std) * np.sqrt(252),
+            'max_drawdown': self.max_drawdown,
+            'volatility': std * np.sqrt(252) * 100
+        }
+
+def calculate_stats_streaming(filepath, chunksize=100_000):
+    """
+    Single-pass, out-of-core version of calculate_basic_stats and
+    calculate_risk_metrics
+    
+    Returns:
+        tuple: (basic_stats, risk_metrics) with the in-memory keys
+    """
+    stats = StreamingStats()
+    reader = pd.read_csv(filepath, chunksize=chunksize,
+                         usecols=['date', 'daily_return_pct', 'account_value_usd'],
+                         parse_dates=['date'])
+    for chunk in reader:
+        stats.update(chunk)
+    
+    if stats.count == 0:
+        raise ValueError(f"No rows in {filepath}")
+    
+    return stats.basic_stats(), stats.risk_metrics()
+
+def print_report(basic_stats, risk_metrics, df=None):
     """Print formatted performance report"""
     
     print("=" * 80)
@@ -98,8 +240,8 @@ def print_report(basic_stats, risk_metrics, df):
     print("=" * 80)
     
     print(f"\nDATA PERIOD:")
-    print(f"Start Date:     {df.iloc[0]['date'].strftime('%B %d, %Y')}")
-    print(f"End Date:       {df.iloc[-1]['date'].strftime('%B %d, %Y')}")
+    print(f"Start Date:     {basic_stats['start_date'].strftime('%B %d, %Y')}")
+    print(f"End Date:       {basic_stats['end_date'].strftime('%B %d, %Y')}")
     print(f"Trading Days:   {basic_stats['num_days']}")
     
     print(f"\nPERFORMANCE:")
@@ -128,22 +270,55 @@ def print_report(basic_stats, risk_metrics, df):
     print("using the raw CSV data provided in /data directory.")
     print("=" * 80 + "\n")
 
-def verify_claims():
+def cached_stats(df, cache, force=False):
+    """
+    calculate_basic_stats + calculate_risk_metrics, reused from the report
+    cache when the rows are unchanged since the last run
+    
+    Returns:
+        tuple: (basic_stats, risk_metrics, from_cache)
+    """
+    key = cache.fingerprint(df, {'report': 'verify'})
+    cached = None if force else cache.load_result(key)
+    if cached is not None:
+        return cached[0], cached[1], True
+    
+    basic_stats = calculate_basic_stats(df)
+    risk_metrics = calculate_risk_metrics(df)
+    cache.save_result(key, (basic_stats, risk_metrics))
+    return basic_stats, risk_metrics, False
+
+def verify_claims(filepath=LIVE_DATA_FILE, streaming=False, chunksize=100_000, force=False):
     """Main verification function"""
     
     print("\nLoading live simulation data...")
     
+    if streaming:
+        try:
+            basic_stats, risk_metrics = calculate_stats_streaming(filepath, chunksize)
+        except FileNotFoundError:
+            print(f"ERROR: Could not find {filepath}")
+            print("Please run this script from the repository root directory.")
+            return
+        
+        print_report(basic_stats, risk_metrics)
+        
+        print("VERIFICATION CHECKS:")
+        print(f"✓ All {basic_stats['num_days']} rows streamed in chunks of {chunksize:,}")
+        print(f"✓ Date range confirmed: {basic_stats['start_date'].strftime('%Y-%m-%d')} to {basic_stats['end_date'].strftime('%Y-%m-%d')}")
+        print("\n✅ Performance data verified successfully!\n")
+        return
+    
     try:
-        df = load_data('data/live_simulation_dec3_jan16.csv')
+        df = load_data(filepath)
     except FileNotFoundError:
-        print("ERROR: Could not find data/live_simulation_dec3_jan16.csv")
+        print(f"ERROR: Could not find {filepath}")
         print("Please run this script from the repository root directory.")
         return
     
-    print("Calculating statistics...\n")
-    
-    basic_stats = calculate_basic_stats(df)
-    risk_metrics = calculate_risk_metrics(df)
+    basic_stats, risk_metrics, from_cache = cached_stats(df, ReportCache(), force)
+    print("Data unchanged since last run - using cached statistics\n" if from_cache
+          else "Calculating statistics...\n")
     
     print_report(basic_stats, risk_metrics, df)
     
@@ -155,5 +330,20 @@ def verify_claims():
     print(f"✓ Account value progression is logical")
     print("\n✅ Performance data verified successfully!\n")
 
+def main():
+    """Parse arguments and verify the performance data"""
+    
+    parser = argparse.ArgumentParser(description="Verify Claude Quant performance data")
+    parser.add_argument('--file', default=LIVE_DATA_FILE, help="P&L CSV to verify")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Single-pass chunked mode for files larger than memory")
+    parser.add_argument('--chunksize', type=int, default=100_000,
+                        help="Rows per chunk in streaming mode")
+    parser.add_argument('--force', action='store_true',
+                        help="Recalculate even if the data is unchanged")
+    args = parser.parse_args()
+    
+    verify_claims(args.file, args.streaming, args.chunksize, args.force)
+
 if __name__ == "__main__":
-    verify_claims()
+    main()
@@ -7,19 +7,164 @@ Creates visual charts of the trading performance data.
 
 Usage:
     python visualize_performance.py
+    python visualize_performance.py --preview   # fast low-dpi daily report
+    python visualize_performance.py --force     # ignore the report cache
 
 Requirements:
     pip install pandas matplotlib numpy
 """
 
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-import matplotlib.pyplot as plt
 import numpy as np
 from datetime import datetime
 
-def create_equity_curve(df, output_file='equity_curve.png'):
+from downsampling import lttb_indices, merge_indices, minmax_indices
+from report_cache import ReportCache
+from series_store import load_table
+
+PLOT_STYLE = 'seaborn-v0_8-darkgrid'
+
+FULL_DPI = 300
+PREVIEW_DPI = 100
+
+# Maximum rows plotted per time-series chart (beyond this the data is
+# downsampled; full-size charts stay visually lossless at 300 dpi)
+FULL_MAX_POINTS = 4000
+PREVIEW_MAX_POINTS = 500
+
+# Above this many bars, daily returns are drawn as one vlines collection
+# instead of one rectangle per day
+BAR_MAX_ROWS = 500
+
+# pyplot is imported on first render, so runs where every chart is
+# unchanged (and anything importing compute_derived) skip matplotlib
+plt = None
+
+def _pyplot():
+    """Import pyplot on first use (Agg backend, plot style applied once)"""
+    global plt
+    if plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Files only - no display needed, safe in worker processes
+        import matplotlib.pyplot as pyplot
+        pyplot.style.use(PLOT_STYLE)
+        plt = pyplot
+    return plt
+
+def compute_derived(df, previous=None):
+    """
+    Compute the series shared by several charts, once
+    
+    Args:
+        df: Performance data
+        previous: Optional 'cumulative', 'running_max' and 'drawdown' arrays
+                  computed for the first rows of df; only the remaining
+                  rows are computed (append-only updates)
+    
+    Returns:
+        dict: 'returns' (fractional), 'cumulative' (growth of 1),
+              'cumulative_pct', 'running_max', 'drawdown' (%),
+              'max_dd_idx' (row position) and 'mean_return' (%)
+    """
+    returns = df['daily_return_pct'].to_numpy(dtype=float) / 100
+    
+    if previous is not None and 0 < len(previous['cumulative']) <= len(returns):
+        start = len(previous['cumulative'])
+        # Seed the product with the last cached level so every value is
+        # bit-identical to a full recomputation
+        tail = np.cumprod(np.concatenate(([previous['cumulative'][-1]],
+                                          1 + returns[start:])))[1:]
+        tail_max = np.maximum.accumulate(np.concatenate(([previous['running_max'][-1]], tail)))[1:]
+        cumulative = np.concatenate((previous['cumulative'], tail))
+        running_max = np.concatenate((previous['running_max'], tail_max))
+        drawdown = np.concatenate((previous['drawdown'], ((tail / tail_max) - 1) * 100))
+    else:
+        cumulative = np.cumprod(1 + returns)
+        running_max = np.maximum.accumulate(cumulative)
+        drawdown = ((cumulative / running_max) - 1) * 100
+    
+    return {
+        'returns': returns,
+        'cumulative': cumulative,
+        'cumulative_pct': (cumulative - 1) * 100,
+        'running_max': running_max,
+        'drawdown': drawdown,
+        'max_dd_idx': int(np.argmin(drawdown)),
+        'mean_return': float(df['daily_return_pct'].mean())
+    }
+
+def cached_derived(df, cache, state_name='derived'):
+    """
+    compute_derived() that reuses the cached state of an earlier run
+    
+    If df starts with exactly the rows of the cached state, only the
+    appended rows are computed; the state is then saved for the next run.
+    """
+    rows = df['daily_return_pct'].to_numpy(dtype=float)
+    previous = cache.load_prefix(state_name, rows)
+    derived = compute_derived(df, previous)
+    
+    if previous is None or len(previous['cumulative']) != len(rows):
+        cache.save_prefix(state_name, rows,
+                          {key: derived[key] for key in ('cumulative', 'running_max', 'drawdown')})
+    return derived
+
+def select_rows(name, df, derived, max_points):
+    """
+    Rows to plot for a time-series chart
+    
+    - Line charts (equity, cumulative return) use LTTB to keep their shape
+    - Drawdown and daily-return bars use a min/max envelope so every
+      extreme survives
+    - First, last and max-drawdown rows are always kept, so annotations
+      still point at the right place
+    
+    Returns:
+        np.ndarray: Sorted row indices, or None to plot every row
+    """
+    n = len(df)
+    if n <= max_points:
+        return None
+    
+    x = df['date'].to_numpy().astype('datetime64[ns]').astype(np.int64).astype(float)
+    required = [0, n - 1, derived['max_dd_idx']]
+    
+    if name == 'equity_curve':
+        # Two panels share the rows: the line's shape and the bars' extremes
+        return merge_indices(lttb_indices(x, df['account_value_usd'], max_points // 2),
+                             minmax_indices(df['daily_return_pct'], max_points // 4),
+                             required)
+    if name == 'drawdown':
+        return merge_indices(minmax_indices(derived['drawdown'], max_points // 2), required)
+    if name == 'cumulative_returns':
+        return merge_indices(lttb_indices(x, derived['cumulative_pct'], max_points), required)
+    return None
+
+def thin(df, derived, keep):
+    """
+    Restrict df and the derived series to the kept rows
+    
+    Returns:
+        tuple: (df, derived) with max_dd_idx remapped to the kept rows
+    """
+    if keep is None:
+        return df, derived
+    
+    thinned = {key: value[keep] if isinstance(value, np.ndarray) else value
+               for key, value in derived.items()}
+    thinned['max_dd_idx'] = int(np.searchsorted(keep, derived['max_dd_idx']))
+    return df.iloc[keep].reset_index(drop=True), thinned
+
+def create_equity_curve(df, output_file='equity_curve.png', derived=None, dpi=FULL_DPI):
     """Create equity curve visualization"""
     
+    _pyplot()
+    
     fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
     
     # Main equity curve
@@ -40,8 +185,12 @@ def create_equity_curve(df, output_file='equity_curve.png'):
     ax1.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x:.1f}M'))
     
     # Daily returns
-    colors = ['green' if x > 0 else 'red' for x in df['daily_return_pct']]
-    ax2.bar(df['date'], df['daily_return_pct'], color=colors, alpha=0.7)
+    daily_returns = df['daily_return_pct'].to_numpy()
+    colors = np.where(daily_returns > 0, 'green', 'red')
+    if len(df) > BAR_MAX_ROWS:
+        ax2.vlines(df['date'], 0, daily_returns, colors=colors, alpha=0.7, linewidth=0.8)
+    else:
+        ax2.bar(df['date'], daily_returns, color=colors, alpha=0.7)
     ax2.set_title('Daily Returns', fontsize=14, fontweight='bold', pad=15)
     ax2.set_xlabel('Date', fontsize=12, fontweight='bold')
     ax2.set_ylabel('Daily Return (%)', fontsize=12, fontweight='bold')
@@ -53,14 +202,16 @@ def create_equity_curve(df, output_file='equity_curve.png'):
         ax.tick_params(axis='x', rotation=45)
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     print(f"✓ Equity curve saved: {output_file}")
     
     return fig
 
-def create_distribution_chart(df, output_file='return_distribution.png'):
+def create_distribution_chart(df, output_file='return_distribution.png', derived=None, dpi=FULL_DPI):
     """Create return distribution histogram"""
     
+    _pyplot()
+    
     fig, ax = plt.subplots(figsize=(12, 7))
     
     # Histogram
@@ -75,7 +226,7 @@ def create_distribution_chart(df, output_file='return_distribution.png'):
             patch.set_facecolor('green')
     
     # Add mean line
-    mean_return = df['daily_return_pct'].mean()
+    mean_return = derived['mean_return'] if derived else df['daily_return_pct'].mean()
     ax.axvline(x=mean_return, color='blue', linestyle='--', 
                linewidth=2, label=f'Mean: {mean_return:+.2f}%')
     
@@ -90,19 +241,19 @@ def create_distribution_chart(df, output_file='return_distribution.png'):
     ax.grid(alpha=0.3, axis='y', linestyle='--')
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     print(f"✓ Distribution chart saved: {output_file}")
     
     return fig
 
-def create_drawdown_chart(df, output_file='drawdown.png'):
+def create_drawdown_chart(df, output_file='drawdown.png', derived=None, dpi=FULL_DPI):
     """Create drawdown visualization"""
     
-    # Calculate drawdown
-    returns = df['daily_return_pct'] / 100
-    cumulative = (1 + returns).cumprod()
-    running_max = cumulative.expanding().max()
-    drawdown = ((cumulative / running_max) - 1) * 100
+    _pyplot()
+    
+    if derived is None:
+        derived = compute_derived(df)
+    drawdown = derived['drawdown']
     
     fig, ax = plt.subplots(figsize=(14, 6))
     
@@ -111,8 +262,8 @@ def create_drawdown_chart(df, output_file='drawdown.png'):
     ax.plot(df['date'], drawdown, color='darkred', linewidth=2)
     
     # Mark maximum drawdown
-    max_dd_idx = drawdown.idxmin()
-    max_dd_date = df.loc[max_dd_idx, 'date']
+    max_dd_idx = derived['max_dd_idx']
+    max_dd_date = df['date'].iloc[max_dd_idx]
     max_dd_value = drawdown[max_dd_idx]
     ax.scatter([max_dd_date], [max_dd_value], 
                color='darkred', s=100, zorder=5)
@@ -130,16 +281,19 @@ def create_drawdown_chart(df, output_file='drawdown.png'):
     ax.legend(fontsize=11)
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     print(f"✓ Drawdown chart saved: {output_file}")
     
     return fig
 
-def create_cumulative_returns(df, output_file='cumulative_returns.png'):
+def create_cumulative_returns(df, output_file='cumulative_returns.png', derived=None, dpi=FULL_DPI):
     """Create cumulative returns chart"""
     
-    returns = df['daily_return_pct'] / 100
-    cumulative = ((1 + returns).cumprod() - 1) * 100
+    _pyplot()
+    
+    if derived is None:
+        derived = compute_derived(df)
+    cumulative = derived['cumulative_pct']
     
     fig, ax = plt.subplots(figsize=(14, 7))
     
@@ -156,7 +310,7 @@ def create_cumulative_returns(df, output_file='cumulative_returns.png'):
     ax.legend(fontsize=11)
     
     # Add final value annotation
-    final_return = cumulative.iloc[-1]
+    final_return = cumulative[-1]
     final_date = df.iloc[-1]['date']
     ax.annotate(f'{final_return:+.1f}%', 
                 xy=(final_date, final_return),
@@ -165,49 +319,134 @@ def create_cumulative_returns(df, output_file='cumulative_returns.png'):
                 bbox=dict(boxstyle='round,pad=0.5', facecolor='lightgreen', alpha=0.8))
     
     plt.tight_layout()
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
+    plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
     print(f"✓ Cumulative returns chart saved: {output_file}")
     
     return fig
 
+# Chart name -> (function, output file)
+CHARTS = {
+    'equity_curve': (create_equity_curve, 'equity_curve.png'),
+    'distribution': (create_distribution_chart, 'return_distribution.png'),
+    'drawdown': (create_drawdown_chart, 'drawdown.png'),
+    'cumulative_returns': (create_cumulative_returns, 'cumulative_returns.png'),
+}
+
+def _init_worker():
+    """Worker initializer: import pyplot and apply the plot style"""
+    _pyplot()
+
+def _render_chart(name, df, derived, dpi):
+    """Render one chart and release its figure"""
+    func, output_file = CHARTS[name]
+    fig = func(df, output_file, derived=derived, dpi=dpi)
+    plt.close(fig)
+    return output_file
+
+def render_all(df, preview=False, parallel=True, max_workers=None,
+               cache=None, state_name='derived', force=False):
+    """
+    Render every chart from one set of derived series
+    
+    Args:
+        df: Performance data
+        preview: Low dpi and downsampled points for quick reports
+        parallel: Render each figure in its own worker process
+        max_workers: Worker count (one per chart if None)
+        cache: Optional ReportCache; charts whose data and parameters are
+               unchanged since they were last written are skipped
+        state_name: Cache state name for this data source
+        force: Render every chart even if the cache says it is current
+        
+    Returns:
+        tuple: (output files in CHARTS order, names of skipped charts)
+    """
+    dpi = PREVIEW_DPI if preview else FULL_DPI
+    max_points = PREVIEW_MAX_POINTS if preview else FULL_MAX_POINTS
+    
+    keys = {}
+    if cache is not None:
+        data_key = cache.fingerprint(df)
+        keys = {name: cache.derive_key(data_key, {'chart': name, 'dpi': dpi,
+                                                  'max_points': max_points})
+                for name in CHARTS}
+    
+    pending = [name for name in CHARTS
+               if force or name not in keys or not cache.is_current(CHARTS[name][1], keys[name])]
+    skipped = [name for name in CHARTS if name not in pending]
+    outputs = [output_file for _, output_file in CHARTS.values()]
+    if not pending:
+        return outputs, skipped
+    
+    derived = compute_derived(df) if cache is None else cached_derived(df, cache, state_name)
+    
+    # The histogram needs every row; only the time-series charts are thinned
+    inputs = {name: thin(df, derived, select_rows(name, df, derived, max_points))
+              for name in pending}
+    
+    if not parallel:
+        _init_worker()
+        for name in pending:
+            _render_chart(name, *inputs[name], dpi)
+    else:
+        workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            futures = [executor.submit(_render_chart, name, *inputs[name], dpi) for name in pending]
+            for future in futures:
+                future.result()
+    
+    for name in pending:
+        if name in keys:
+            cache.record(CHARTS[name][1], keys[name])
+    return outputs, skipped
+
 def main():
     """Generate all visualizations"""
     
+    parser = argparse.ArgumentParser(description="Generate performance charts")
+    parser.add_argument('--preview', action='store_true',
+                        help=f"Fast mode: {PREVIEW_DPI} dpi, at most {PREVIEW_MAX_POINTS} points per chart")
+    parser.add_argument('--serial', action='store_true',
+                        help="Render charts one after another in this process")
+    parser.add_argument('--force', action='store_true',
+                        help="Re-render every chart even if its data is unchanged")
+    args = parser.parse_args()
+    
     print("\n" + "=" * 60)
     print("CLAUDE QUANT - PERFORMANCE VISUALIZATION")
     print("=" * 60 + "\n")
     
     print("Loading data...")
     
+    data_file = 'data/live_simulation_dec3_jan16.csv'
     try:
-        df = pd.read_csv('data/live_simulation_dec3_jan16.csv')
-        df['date'] = pd.to_datetime(df['date'])
+        df = load_table(data_file)
     except FileNotFoundError:
-        print("ERROR: Could not find data/live_simulation_dec3_jan16.csv")
+        print(f"ERROR: Could not find {data_file}")
         print("Please run this script from the repository root directory.")
         return
     
     print(f"Loaded {len(df)} days of data\n")
     print("Creating visualizations...\n")
     
-    # Create all charts
-    create_equity_curve(df)
-    create_distribution_chart(df)
-    create_drawdown_chart(df)
-    create_cumulative_returns(df)
+    start = time.perf_counter()
+    state_name = os.path.splitext(os.path.basename(data_file))[0]
+    output_files, skipped = render_all(df, preview=args.preview, parallel=not args.serial,
+                                       cache=ReportCache(), state_name=state_name,
+                                       force=args.force)
+    elapsed = time.perf_counter() - start
+    
+    for name in skipped:
+        print(f"• {CHARTS[name][1]} unchanged - skipped")
     
     print("\n" + "=" * 60)
-    print("✅ All visualizations created successfully!")
+    print(f"✅ All visualizations created successfully! ({elapsed:.2f}s)")
     print("=" * 60 + "\n")
     
     print("Generated files:")
-    print("  - equity_curve.png")
-    print("  - return_distribution.png")
-    print("  - drawdown.png")
-    print("  - cumulative_returns.png")
+    for output_file in output_files:
+        print(f"  - {output_file}")
     print()
 
 if __name__ == "__main__":
-    # Set style
-    plt.style.use('seaborn-v0_8-darkgrid')
     main()
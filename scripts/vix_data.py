@@ -0,0 +1,177 @@
+"""
+VIX Data Sources
+================
+
+Pluggable sources of daily VIX and VIX3M closes for vix_monitor.py.
+
+- YahooVIXSource:  one batched yfinance download of ^VIX and ^VIX3M
+- CSVVIXSource:    local file (date, VIX, VIX3M) - no network required
+- CachedVIXSource: wraps any source with an on-disk SQLite cache and
+                   TTL-based invalidation
+
+All sources return a DataFrame indexed by date with float columns
+'VIX' and 'VIX3M'. pandas is imported on first fetch, so importing this
+module (and vix_monitor) stays cheap.
+
+Requirements:
+    pip install pandas
+    pip install yfinance  # only for YahooVIXSource
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+
+COLUMNS = ['VIX', 'VIX3M']
+
+# Yahoo tickers for each column
+TICKERS = {'^VIX': 'VIX', '^VIX3M': 'VIX3M'}
+
+# Resolved from this file, so the cache works from any working directory
+DEFAULT_CACHE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'data', 'vix_cache.sqlite')
+
+DEFAULT_TTL_SECONDS = 15 * 60
+
+class VIXDataSource:
+    """Base class for VIX data sources"""
+
+    def fetch(self) -> 'pd.DataFrame':
+        """
+        Fetch daily closes
+
+        Returns:
+            pd.DataFrame: Date-indexed 'VIX' and 'VIX3M' columns
+        """
+        raise NotImplementedError
+
+class YahooVIXSource(VIXDataSource):
+    """
+    Download ^VIX and ^VIX3M from Yahoo Finance in a single request
+
+    The default 3-month period covers both the latest close and the
+    20-day moving average.
+    """
+
+    def __init__(self, period: str = '3mo'):
+        self.period = period
+
+    def fetch(self) -> 'pd.DataFrame':
+        import pandas as pd
+        import yfinance as yf
+
+        data = yf.download(list(TICKERS), period=self.period, interval='1d',
+                           progress=False)
+        closes = data['Close'].rename(columns=TICKERS)
+        closes.index = pd.to_datetime(closes.index).tz_localize(None).normalize()
+        closes.index.name = 'date'
+        return closes[COLUMNS].astype(float).dropna(how='all')
+
+class CSVVIXSource(VIXDataSource):
+    """
+    Read daily closes from a local CSV file
+
+    Expected columns: date, VIX, VIX3M
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+
+    def fetch(self) -> 'pd.DataFrame':
+        import pandas as pd
+        df = pd.read_csv(self.filepath, parse_dates=['date'], index_col='date')
+        return df[COLUMNS].astype(float).sort_index()
+
+class CachedVIXSource(VIXDataSource):
+    """
+    Cache another source's closes in a SQLite file
+
+    The cache is served while it is younger than ttl_seconds. When it has
+    expired, the upstream source is fetched once and the cache rewritten.
+    If the upstream fetch fails, a stale cache is served with a warning
+    rather than falling back to made-up levels. If the cache cannot be
+    written, the fresh data is still returned (with a warning).
+    """
+
+    def __init__(self, upstream: VIXDataSource,
+                 cache_file: str = DEFAULT_CACHE_FILE,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.upstream = upstream
+        self.cache_file = cache_file
+        self.ttl_seconds = ttl_seconds
+        self.last_fetch_was_cached = False
+
+    def fetch(self) -> 'pd.DataFrame':
+        cached, fetched_at = self._read_cache()
+
+        if cached is not None and time.time() - fetched_at < self.ttl_seconds:
+            self.last_fetch_was_cached = True
+            return cached
+
+        try:
+            fresh = self.upstream.fetch()
+        except Exception as e:
+            if cached is None:
+                raise
+            age_min = (time.time() - fetched_at) / 60
+            print(f"Warning: VIX refresh failed ({e}); using cache from {age_min:.0f} min ago")
+            self.last_fetch_was_cached = True
+            return cached
+
+        try:
+            self._write_cache(fresh)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Warning: Could not write VIX cache {self.cache_file} ({e}); "
+                  f"using fresh data uncached")
+        self.last_fetch_was_cached = False
+        return fresh
+
+    def invalidate(self) -> None:
+        """Force the next fetch to go to the upstream source"""
+        if not os.path.exists(self.cache_file):
+            return
+        with closing(sqlite3.connect(self.cache_file)) as conn, conn:
+            conn.execute("DROP TABLE IF EXISTS vix_meta")
+
+    def _read_cache(self):
+        """Cached closes and fetch time; read-only, so a missing cache stays missing"""
+        import pandas as pd
+        uri = Path(os.path.abspath(self.cache_file)).as_uri() + '?mode=ro'
+        try:
+            with closing(sqlite3.connect(uri, uri=True)) as conn, conn:
+                row = conn.execute(
+                    "SELECT fetched_at FROM vix_meta LIMIT 1").fetchone()
+                if row is None:
+                    return None, 0.0
+                df = pd.read_sql_query(
+                    "SELECT date, vix AS VIX, vix3m AS VIX3M FROM vix_closes ORDER BY date",
+                    conn, parse_dates=['date'], index_col='date')
+        except sqlite3.Error:
+            return None, 0.0
+        return df.astype(float), row[0]
+
+    def _write_cache(self, df: 'pd.DataFrame') -> None:
+        rows = [(ts.strftime('%Y-%m-%d'), _to_sql(vix), _to_sql(vix3m))
+                for ts, vix, vix3m in df[COLUMNS].itertuples()]
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with closing(sqlite3.connect(self.cache_file)) as conn, conn:
+            conn.execute("DROP TABLE IF EXISTS vix_closes")
+            conn.execute("CREATE TABLE vix_closes (date TEXT PRIMARY KEY, vix REAL, vix3m REAL)")
+            conn.executemany("INSERT INTO vix_closes VALUES (?, ?, ?)", rows)
+            conn.execute("DROP TABLE IF EXISTS vix_meta")
+            conn.execute("CREATE TABLE vix_meta (fetched_at REAL)")
+            conn.execute("INSERT INTO vix_meta VALUES (?)", (time.time(),))
+
+def _to_sql(value):
+    """NaN -> NULL for SQLite"""
+    return None if value is None or value != value else float(value)
+
+def default_source(cache_file: str = DEFAULT_CACHE_FILE,
+                   ttl_seconds: float = DEFAULT_TTL_SECONDS) -> VIXDataSource:
+    """Yahoo Finance behind the on-disk cache"""
+    return CachedVIXSource(YahooVIXSource(), cache_file, ttl_seconds)
@@ -14,13 +14,18 @@ Requirements:
 
 Usage:
     python vix_monitor.py
+    python vix_monitor.py --csv data/vix_history.csv   # offline
 """
 
-import yfinance as yf
+import argparse
+from collections import namedtuple
 from datetime import datetime, timedelta
 import warnings
 warnings.filterwarnings('ignore')
 
+from risk_core import BACKWARDATION_MULTIPLIER, MONITOR_TABLE
+from vix_data import CSVVIXSource, VIXDataSource, default_source
+
 class VIXMonitor:
     """
     Monitor VIX levels and adjust position sizing accordingly
@@ -35,77 +40,99 @@ class VIXMonitor:
     Production values are proprietary.
     """
     
-    # Example thresholds (production values proprietary)
-    VIX_THRESHOLDS = {
-        'low': 15,
-        'normal': 20,
-        'elevated': 30
-    }
-    
-    # Example multipliers (production values proprietary)
-    REGIME_MULTIPLIERS = {
-        'low': 1.00,      # Full size
-        'normal': 0.85,   # 15% reduction
-        'elevated': 0.65, # 35% reduction
-        'crisis': 0.40    # 60% reduction
-    }
-    
-    def __init__(self):
-        """Initialize VIX monitor and fetch current data"""
-        print("Fetching VIX data...")
-        self.vix_current = self._fetch_vix()
-        self.vix_ma20 = self._fetch_vix_ma()
-        self.vix_3m = self._fetch_vix_term_structure()
+    # Precompiled thresholds and multipliers, shared with the session
+    # reference code (example values - production values proprietary)
+    REGIME_TABLE = MONITOR_TABLE
+    
+    VIX_THRESHOLDS = REGIME_TABLE.threshold_dict()    # 15 / 20 / 30
+    
+    REGIME_MULTIPLIERS = REGIME_TABLE.as_dict()       # 1.00 / 0.85 / 0.65 / 0.40
+    
+    # Additional reduction when VIX > VIX3M (backwardation)
+    BACKWARDATION_MULTIPLIER = BACKWARDATION_MULTIPLIER
+    
+    # Levels used when no data source is reachable and nothing is cached
+    FALLBACK_VIX = 15.0
+    FALLBACK_CONTANGO = 1.1
+    
+    def __init__(self, source: VIXDataSource = None):
+        """
+        Initialize VIX monitor and fetch current data
         
-    def _fetch_vix(self) -> float:
+        Args:
+            source: VIX data source (cached Yahoo Finance if None)
         """
-        Get current VIX level
+        self.source = source if source is not None else default_source()
+        self.is_fallback = False
+        self.refresh()
+    
+    def refresh(self) -> None:
+        """
+        Load VIX, 20-day MA and VIX3M from a single fetch of the data source
         
-        Returns:
-            float: Current VIX closing price
+        If the source fails, fallback levels are used and is_fallback is set
+        so callers can tell the regime is not based on market data.
         """
+        print("Fetching VIX data...")
         try:
-            vix_data = yf.download("^VIX", period="5d", interval="1d", 
-                                   progress=False)
-            return float(vix_data['Close'].iloc[-1])
+            closes = self.source.fetch()
         except Exception as e:
             print(f"Warning: Could not fetch VIX data: {e}")
-            return 15.0  # Default to normal level
+            print(f"         Using fallback VIX {self.FALLBACK_VIX:.2f} - regime is NOT live")
+            self.is_fallback = True
+            self.vix_current = self.FALLBACK_VIX
+            self.vix_ma20 = self.FALLBACK_VIX
+            self.vix_3m = self.FALLBACK_VIX * self.FALLBACK_CONTANGO
+            return
+        
+        self.is_fallback = False
+        self.vix_current = self._latest_vix(closes)
+        self.vix_ma20 = self._vix_ma(closes)
+        self.vix_3m = self._latest_vix3m(closes)
+    
+    def _latest_vix(self, closes) -> float:
+        """
+        Get current VIX level
+        
+        Returns:
+            float: Latest VIX close
+        """
+        return float(closes['VIX'].dropna().iloc[-1])
     
-    def _fetch_vix_ma(self) -> float:
+    def _vix_ma(self, closes, window: int = 20) -> float:
         """
         Get 20-day VIX moving average
         
         Returns:
             float: 20-day MA of VIX
         """
-        try:
-            vix_data = yf.download("^VIX", period="30d", interval="1d",
-                                   progress=False)
-            ma = vix_data['Close'].rolling(20).mean()
-            return float(ma.iloc[-1])
-        except Exception as e:
-            print(f"Warning: Could not fetch VIX MA: {e}")
-            return 15.0
+        return float(closes['VIX'].dropna().rolling(window).mean().iloc[-1])
     
-    def _fetch_vix_term_structure(self) -> float:
+    def _latest_vix3m(self, closes) -> float:
         """
-        Get 3-month VIX futures (term structure signal)
+        Get 3-month VIX (term structure signal)
         
         Note: Simplified implementation.
         Production uses actual VX futures data.
         
         Returns:
-            float: 3-month VIX level
+            float: Latest VIX3M close
         """
-        try:
-            # VIX3M as proxy (production uses VX futures)
-            vix3m_data = yf.download("^VIX3M", period="5d", interval="1d",
-                                     progress=False)
-            return float(vix3m_data['Close'].iloc[-1])
-        except Exception as e:
+        vix3m = closes['VIX3M'].dropna()
+        if vix3m.empty:
             # Fallback: assume normal contango
-            return self.vix_current * 1.1
+            return self.vix_current * self.FALLBACK_CONTANGO
+        return float(vix3m.iloc[-1])
+    
+    @classmethod
+    def classify(cls, vix_level: float) -> str:
+        """
+        Classify a VIX level into a regime
+        
+        Returns:
+            str: 'low', 'normal', 'elevated', or 'crisis'
+        """
+        return cls.REGIME_TABLE.name(vix_level)
     
     def get_regime(self) -> str:
         """
@@ -114,14 +141,7 @@ class VIXMonitor:
         Returns:
             str: 'low', 'normal', 'elevated', or 'crisis'
         """
-        if self.vix_current < self.VIX_THRESHOLDS['low']:
-            return 'low'
-        elif self.vix_current < self.VIX_THRESHOLDS['normal']:
-            return 'normal'
-        elif self.vix_current < self.VIX_THRESHOLDS['elevated']:
-            return 'elevated'
-        else:
-            return 'crisis'
+        return self.classify(self.vix_current)
     
     def get_multiplier(self) -> float:
         """
@@ -140,7 +160,7 @@ class VIXMonitor:
         is_backwardation = self.vix_current > self.vix_3m
         
         if is_backwardation:
-            stress_mult = 0.75  # Additional 25% reduction
+            stress_mult = self.BACKWARDATION_MULTIPLIER  # Additional 25% reduction
             stress_text = "⚠️  VIX Backwardation (stress signal)"
         else:
             stress_mult = 1.0
@@ -223,6 +243,169 @@ class VIXMonitor:
         print("    Sharpe ratio and reduced maximum drawdown by ~30%.")
         print("=" * 70 + "\n")
 
+RegimeChange = namedtuple(
+    'RegimeChange',
+    ['timestamp', 'old_regime', 'new_regime', 'old_multiplier', 'new_multiplier',
+     'vix', 'backwardation'])
+
+def _missing(value) -> bool:
+    """None or NaN"""
+    return value is None or value != value
+
+class VIXRegimeTracker:
+    """
+    Streaming VIX regime tracker
+    
+    Consumes VIX ticks and daily bars one at a time and keeps the 20-day
+    MA, backwardation flag, regime and multiplier current in O(1) per
+    update. Daily closes go into a fixed-size ring buffer with a running
+    sum, so the MA never rescans history.
+    
+    Ticks (on_tick) move the current level intraday without touching the
+    MA window; bars (on_bar) commit a daily close into the window. A
+    missing VIX (NaN, e.g. a blank CSV cell) is skipped entirely, as the
+    batch path drops it, and a missing VIX3M keeps the last known one.
+    
+    Callbacks registered with subscribe() receive a RegimeChange whenever
+    the regime or the position multiplier changes.
+    """
+    
+    # Recompute the running sum from the buffer this often to stop
+    # floating-point drift from the add/subtract updates
+    RESUM_INTERVAL = 1024
+    
+    def __init__(self, window: int = 20, monitor_cls=VIXMonitor):
+        """
+        Args:
+            window: Moving-average window in bars
+            monitor_cls: Supplies thresholds and multipliers (VIXMonitor)
+        """
+        self.window = window
+        self.monitor_cls = monitor_cls
+        
+        self._closes = [0.0] * window
+        self._next = 0
+        self._count = 0
+        self._sum = 0.0
+        self._updates_since_resum = 0
+        
+        self.vix = None
+        self.vix_3m = None
+        self.backwardation = False
+        self.regime = None
+        self.multiplier = None
+        
+        self._listeners = []
+    
+    def subscribe(self, callback) -> None:
+        """Register callback(RegimeChange) for regime/multiplier changes"""
+        self._listeners.append(callback)
+    
+    @property
+    def vix_ma(self) -> float:
+        """Moving average of committed closes (None until the window fills)"""
+        if self._count < self.window:
+            return None
+        return self._sum / self.window
+    
+    def on_tick(self, vix: float, vix_3m: float = None, timestamp=None) -> RegimeChange:
+        """
+        Update the current level from an intraday tick
+        
+        Returns:
+            RegimeChange or None (also for a tick without a VIX level)
+        """
+        if _missing(vix):
+            return None
+        if not _missing(vix_3m):
+            self.vix_3m = vix_3m
+        self.vix = vix
+        return self._update_state(timestamp)
+    
+    def on_bar(self, close: float, close_3m: float = None, timestamp=None) -> RegimeChange:
+        """
+        Commit a daily close into the MA window and update state
+        
+        Returns:
+            RegimeChange or None (also for a bar without a VIX close)
+        """
+        if _missing(close):
+            return None
+        oldest = self._closes[self._next]
+        self._closes[self._next] = close
+        self._next = (self._next + 1) % self.window
+        
+        if self._count < self.window:
+            self._count += 1
+            self._sum += close
+        else:
+            self._sum += close - oldest
+        
+        self._updates_since_resum += 1
+        if self._updates_since_resum >= self.RESUM_INTERVAL:
+            self._sum = sum(self._closes[:self._count])
+            self._updates_since_resum = 0
+        
+        return self.on_tick(close, close_3m, timestamp)
+    
+    def seed(self, closes) -> None:
+        """
+        Warm up from a DataFrame of daily closes ('VIX', 'VIX3M')
+        
+        Events are not emitted while seeding.
+        """
+        listeners, self._listeners = self._listeners, []
+        try:
+            for timestamp, vix, vix_3m in closes[['VIX', 'VIX3M']].itertuples():
+                self.on_bar(vix, vix_3m, timestamp)
+        finally:
+            self._listeners = listeners
+    
+    def _update_state(self, timestamp) -> RegimeChange:
+        monitor = self.monitor_cls
+        
+        regime = monitor.classify(self.vix)
+        self.backwardation = self.vix_3m is not None and self.vix > self.vix_3m
+        
+        multiplier = monitor.REGIME_MULTIPLIERS[regime]
+        if self.backwardation:
+            multiplier *= monitor.BACKWARDATION_MULTIPLIER
+        
+        if regime == self.regime and multiplier == self.multiplier:
+            return None
+        
+        event = RegimeChange(timestamp, self.regime, regime, self.multiplier,
+                             multiplier, self.vix, self.backwardation)
+        self.regime = regime
+        self.multiplier = multiplier
+        
+        for callback in self._listeners:
+            callback(event)
+        return event
+
+def replay_regime_events(closes):
+    """
+    Stream daily closes through a VIXRegimeTracker and print each change
+    
+    Args:
+        closes: DataFrame of daily closes ('VIX', 'VIX3M')
+    """
+    tracker = VIXRegimeTracker()
+    
+    def print_event(event):
+        date = event.timestamp.strftime('%Y-%m-%d') if event.timestamp is not None else '-'
+        ma = f"{tracker.vix_ma:.2f}" if tracker.vix_ma is not None else "n/a"
+        stress = " (backwardation)" if event.backwardation else ""
+        print(f"{date}  VIX {event.vix:6.2f}  MA20 {ma:>6}  "
+              f"{str(event.old_regime).upper():>9} → {event.new_regime.upper():<9} "
+              f"{event.new_multiplier:.2f}x{stress}")
+    
+    tracker.subscribe(print_event)
+    for timestamp, vix, vix_3m in closes[['VIX', 'VIX3M']].itertuples():
+        tracker.on_bar(vix, vix_3m, timestamp)
+    
+    return tracker
+
 def main():
     """
     Main execution - fetch VIX and display current regime
@@ -231,8 +414,24 @@ def main():
     print("CLAUDE QUANT - VIX REGIME MONITOR")
     print("=" * 70 + "\n")
     
+    parser = argparse.ArgumentParser(description="VIX regime monitor")
+    parser.add_argument('--csv', help="Local CSV of daily closes (date, VIX, VIX3M) - no network")
+    parser.add_argument('--stream', action='store_true',
+                        help="Replay the CSV through the streaming regime tracker")
+    args = parser.parse_args()
+    
+    if args.stream:
+        if not args.csv:
+            parser.error("--stream requires --csv")
+        print("REGIME CHANGE EVENTS:")
+        print("-" * 70)
+        replay_regime_events(CSVVIXSource(args.csv).fetch())
+        print("-" * 70 + "\n")
+        return
+    
     # Initialize monitor
-    monitor = VIXMonitor()
+    source = CSVVIXSource(args.csv) if args.csv else None
+    monitor = VIXMonitor(source)
     
     # Print status
     monitor.print_status()